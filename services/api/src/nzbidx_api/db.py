@@ -257,25 +257,29 @@ async def apply_schema(max_attempts: int = 5, retry_delay: float = 1.0) -> None:
             nonlocal needs_migration
             raw = sync_conn.connection.dbapi_connection
             cur = raw.cursor()
-            for cat in [c for c in CATEGORY_RANGES if c != "other"]:
-                cur.execute(
-                    "SELECT EXISTS (SELECT FROM pg_class WHERE relname = $1)",
-                    (f"release_{cat}",),
-                )
-                exists = bool(cur.fetchone()[0])
-                cur.execute(
-                    """
-                        SELECT EXISTS(
-                            SELECT 1
-                            FROM pg_partitioned_table p
-                            JOIN pg_class c ON p.partrelid = c.oid
-                            JOIN pg_attribute a ON a.attrelid = c.oid AND a.attnum = ANY(p.partattrs)
-                            WHERE c.relname = $1 AND a.attname = 'posted_at'
-                        )
-                    """,
-                    (f"release_{cat}",),
-                )
-                partitioned = bool(cur.fetchone()[0])
+            categories = [
+                c for c, bounds in CATEGORY_RANGES.items() if bounds is not None
+            ]
+            # Look up every category partition in one catalog query rather
+            # than two round trips per category.
+            cur.execute(
+                """
+                    SELECT c.relname, EXISTS(
+                        SELECT 1
+                        FROM pg_partitioned_table p
+                        JOIN pg_attribute a ON a.attrelid = p.partrelid AND a.attnum = ANY(p.partattrs)
+                        WHERE p.partrelid = c.oid AND a.attname = 'posted_at'
+                    )
+                    FROM pg_class c
+                    WHERE c.relname = ANY($1)
+                """,
+                ([f"release_{cat}" for cat in categories],),
+            )
+            by_date = {name: bool(partitioned) for name, partitioned in cur.fetchall()}
+            for cat in categories:
+                table = f"release_{cat}"
+                exists = table in by_date
+                partitioned = by_date.get(table, False)
                 if exists and not partitioned:
                     if migrate_only:
                         needs_migration = True
@@ -534,6 +538,22 @@ async def prune_old_releases(retention_days: int | None = None) -> dict[str, obj
     return result
 
 
+async def create_future_partitions() -> None:
+    """Pre-create ``release`` partitions for the current and next year."""
+
+    engine = get_engine()
+    if not engine:
+        return
+
+    async with engine.connect() as conn:
+
+        def _create(sync_conn: Any) -> None:
+            raw = sync_conn.connection.dbapi_connection
+            ensure_current_and_next_year_partitions(raw)
+
+        await conn.run_sync(_create)
+
+
 # ---------------------------------------------------------------------------
 # Synchronous connection helpers
 # ---------------------------------------------------------------------------
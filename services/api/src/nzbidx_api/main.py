@@ -45,6 +45,7 @@ from .db import (
     vacuum_analyze,
     prune_old_releases,
     get_release_retention_days,
+    create_future_partitions,
 )
 
 try:  # pragma: no cover - optional dependency
@@ -413,6 +414,8 @@ async def start_db_maintenance() -> None:
     scheduler.add_job(analyze, "cron", hour=2)
     scheduler.add_job(reindex, "cron", day_of_week="sun", hour=4)
     scheduler.add_job(prune_disallowed, "cron", hour=1)
+    # Partitions are created off-peak so ingest never waits on the DDL.
+    scheduler.add_job(create_future_partitions, "cron", hour=1, minute=45)
     if retention_days > 0:
         scheduler.add_job(enforce_release_retention, "cron", hour=0, minute=30)
     else:
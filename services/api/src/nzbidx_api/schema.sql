@@ -187,4 +187,3 @@ CREATE INDEX IF NOT EXISTS release_source_group_idx ON release (source_group);
 CREATE INDEX IF NOT EXISTS release_size_bytes_idx ON release (size_bytes);
 CREATE INDEX IF NOT EXISTS release_search_idx ON release USING GIN (search_vector);
 CREATE INDEX IF NOT EXISTS release_posted_at_idx ON release (posted_at DESC);
-CREATE UNIQUE INDEX IF NOT EXISTS release_norm_title_category_id_posted_at_key ON release (norm_title, category_id, posted_at);
@@ -2,16 +2,31 @@
 
 from __future__ import annotations
 
+import hashlib
+import json
 import logging
 import os
 import re
+import time
 from dataclasses import dataclass
+from functools import lru_cache
 from importlib import resources
 from pathlib import Path
 from typing import List
 
 logger = logging.getLogger(__name__)
 
+_TRUTHY = frozenset({"1", "true", "yes", "on"})
+
+
+def _envbool(name: str, default: bool = False) -> bool:
+    """Return ``True`` when environment variable ``name`` is truthy."""
+
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in _TRUTHY
+
 
 @dataclass
 class NNTPSettings:
@@ -47,6 +62,10 @@ def nntp_settings() -> NNTPSettings:
 
 
 NNTP_SETTINGS: NNTPSettings = nntp_settings()
+# Upper bound on simultaneous NNTP connections used by the ingest loop. Values
+# above ``1`` let upcoming groups' headers be fetched while the current group
+# is being written.
+NNTP_MAX_CONN: int = max(1, int(os.getenv("NNTP_MAX_CONN", "1")))
 
 
 from .nntp_client import NNTPClient  # noqa: E402
@@ -217,7 +236,7 @@ def _load_curated_groups() -> List[str]:
     cfg = os.getenv("NNTP_CURATED_GROUP_FILE")
     if cfg:
         try:
-            groups = _parse_group_list(Path(cfg).read_text(encoding="utf-8"))
+            groups = _parse_group_list(Path(cfg).read_bytes().decode("utf-8"))
         except OSError:
             logger.warning(
                 "curated_group_file_unavailable",
@@ -239,7 +258,8 @@ def _load_curated_groups() -> List[str]:
         data = (
             resources.files(__package__)
             .joinpath("curated_groups.txt")
-            .read_text(encoding="utf-8")
+            .read_bytes()
+            .decode("utf-8")
         )
     except (FileNotFoundError, OSError):
         logger.warning(
@@ -262,7 +282,7 @@ def _configured_groups(*, log: bool = True) -> List[str]:
         cfg = os.getenv("NNTP_GROUP_FILE")
         if cfg:
             try:
-                env = Path(cfg).read_text(encoding="utf-8")
+                env = Path(cfg).read_bytes().decode("utf-8")
             except OSError:
                 env = ""
     if env:
@@ -278,6 +298,75 @@ def _configured_groups(*, log: bool = True) -> List[str]:
     return []
 
 
+# Seconds a cached NNTP group enumeration stays valid. ``0`` disables caching.
+NNTP_GROUP_CACHE_TTL: int = int(os.getenv("NNTP_GROUP_CACHE_TTL", "86400"))
+
+_CACHEDIR_TAG = (
+    "Signature: 8a477f597d28d172789f06886806bc55\n"
+    "# This file is a cache directory tag created by nzbidx.\n"
+)
+
+
+def _group_cache_path(wildcard: str) -> Path:
+    """Return the cache file holding groups discovered for ``wildcard``.
+
+    The name is keyed on the NNTP server as well, so pointing ingest at
+    another provider does not reuse the previous server's group list.
+    """
+
+    base = os.getenv("NNTP_GROUP_CACHE_DIR")
+    if base:
+        cache_dir = Path(base)
+    else:
+        xdg = os.getenv("XDG_CACHE_HOME")
+        cache_dir = (Path(xdg) if xdg else Path.home() / ".cache") / "nzbidx"
+    key = f"{NNTP_SETTINGS.host}:{NNTP_SETTINGS.port}\n{wildcard}"
+    digest = hashlib.sha256(key.encode("utf-8")).hexdigest()[:16]
+    return cache_dir / f"groups-{digest}.json"
+
+
+def _read_group_cache(wildcard: str) -> List[str] | None:
+    """Return cached groups for ``wildcard`` or ``None`` if missing or stale."""
+
+    if NNTP_GROUP_CACHE_TTL <= 0:
+        return None
+    path = _group_cache_path(wildcard)
+    try:
+        if time.time() - path.stat().st_mtime >= NNTP_GROUP_CACHE_TTL:
+            return None
+        groups = json.loads(path.read_bytes())
+    except (OSError, ValueError):
+        return None
+    if not isinstance(groups, list) or not groups:
+        return None
+    logger.info(
+        "ingest_groups_cache_hit",
+        extra={"event": "ingest_groups_cache_hit", "path": str(path)},
+    )
+    return [str(g) for g in groups]
+
+
+def _write_group_cache(wildcard: str, groups: List[str]) -> None:
+    """Persist ``groups`` discovered for ``wildcard`` for later startups."""
+
+    if NNTP_GROUP_CACHE_TTL <= 0:
+        return
+    path = _group_cache_path(wildcard)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tag = path.parent / "CACHEDIR.TAG"
+        if not tag.exists():
+            tag.write_text(_CACHEDIR_TAG, encoding="utf-8")
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(list(groups)), encoding="utf-8")
+        tmp.replace(path)
+    except OSError:
+        logger.warning(
+            "ingest_groups_cache_write_failed",
+            extra={"event": "ingest_groups_cache_write_failed", "path": str(path)},
+        )
+
+
 def _load_groups(mode: str | None = None) -> List[str]:
     if mode is None:
         mode = _resolve_group_mode()
@@ -295,8 +384,12 @@ def _load_groups(mode: str | None = None) -> List[str]:
         return []
 
     curated = list(BINSEARCH_GROUPS)
-    client = NNTPClient(NNTP_SETTINGS)
-    discovered = client.list_groups(NNTP_GROUP_WILDCARD)
+    discovered = _read_group_cache(NNTP_GROUP_WILDCARD)
+    if discovered is None:
+        client = NNTPClient(NNTP_SETTINGS)
+        discovered = client.list_groups(NNTP_GROUP_WILDCARD)
+        if discovered:
+            _write_group_cache(NNTP_GROUP_WILDCARD, discovered)
     if discovered:
         available = {name for name in discovered}
         groups = [group for group in curated if group in available]
@@ -373,14 +466,14 @@ IGNORE_GROUPS: List[str] = _load_ignore_groups()
 INGEST_BATCH: int = int(os.getenv("INGEST_BATCH", "1000"))
 # Dynamic batch sizing is bounded by configurable minimum/maximum limits.
 INGEST_BATCH_MIN: int = int(os.getenv("INGEST_BATCH_MIN", "100"))
-INGEST_BATCH_MAX: int = int(os.getenv("INGEST_BATCH_MAX", str(INGEST_BATCH)))
+INGEST_BATCH_MAX: int = (
+    int(os.environ["INGEST_BATCH_MAX"])
+    if "INGEST_BATCH_MAX" in os.environ
+    else INGEST_BATCH
+)
 INGEST_POLL_MIN_SECONDS: int = int(os.getenv("INGEST_POLL_MIN_SECONDS", "5"))
 INGEST_POLL_MAX_SECONDS: int = int(os.getenv("INGEST_POLL_MAX_SECONDS", "60"))
-DETECT_LANGUAGE: bool = os.getenv("DETECT_LANGUAGE", "1").lower() in {
-    "1",
-    "true",
-    "yes",
-}
+DETECT_LANGUAGE: bool = _envbool("DETECT_LANGUAGE", True)
 AUDIO_EXTENSIONS: list[str] = [
     ext.strip().upper()
     for ext in os.getenv(
@@ -397,30 +490,54 @@ BOOK_EXTENSIONS: list[str] = [
     ).split(",")
     if ext.strip()
 ]
-ALLOWED_MOVIE_EXTENSIONS: list[str] = [
+ALLOWED_MOVIE_EXTENSIONS: frozenset[str] = frozenset(
     ext.strip().lower()
     for ext in os.getenv(
         "ALLOWED_MOVIE_EXTENSIONS",
         "mkv,mp4,mov,m4v,mpg,mpeg,avi,flv,webm,wmv,vob,evo,iso,m2ts,ts,rar,r00,7z,zip,001",
     ).split(",")
     if ext.strip()
-]
-ALLOWED_TV_EXTENSIONS: list[str] = [
+)
+ALLOWED_TV_EXTENSIONS: frozenset[str] = frozenset(
     ext.strip().lower()
     for ext in os.getenv(
         "ALLOWED_TV_EXTENSIONS",
         "mkv,mp4,mov,m4v,mpg,mpeg,avi,flv,webm,wmv,vob,evo,iso,m2ts,ts,rar,r00,7z,zip,001",
     ).split(",")
     if ext.strip()
-]
-ALLOWED_ADULT_EXTENSIONS: list[str] = [
+)
+ALLOWED_ADULT_EXTENSIONS: frozenset[str] = frozenset(
     ext.strip().lower()
     for ext in os.getenv(
         "ALLOWED_ADULT_EXTENSIONS",
         "mkv,mp4,mov,m4v,mpg,mpeg,avi,flv,webm,wmv,vob,evo,iso,m2ts,ts,rar,r00,7z,zip,001",
     ).split(",")
     if ext.strip()
-]
+)
+
+
+def allowed_extensions_for_category(category: str) -> frozenset[str] | None:
+    """Return the extension allow-list for ``category`` or ``None``.
+
+    ``category`` is a four digit Newznab category ID such as ``"2040"``.
+    Categories without an allow-list, or malformed IDs, return ``None`` which
+    disables extension filtering.
+    """
+
+    if len(category) != 4 or not category.isdigit():
+        return None
+    # The top-level digit selects the allow-list; the settings are read at
+    # call time so runtime overrides take effect.
+    top = category[0]
+    if top == "2":
+        return ALLOWED_MOVIE_EXTENSIONS
+    if top == "5":
+        return ALLOWED_TV_EXTENSIONS
+    if top == "6":
+        return ALLOWED_ADULT_EXTENSIONS
+    return None
+
+
 CURSOR_DB: str = os.getenv("CURSOR_DB") or os.getenv("DATABASE_URL", "./cursors.sqlite")
 CB_RESET_SECONDS: int = int(os.getenv("CB_RESET_SECONDS", "30"))
 # Base delay applied when database latency exceeds thresholds. Set to ``0`` to
@@ -432,11 +549,7 @@ INGEST_LOG_EVERY: int = int(os.getenv("INGEST_LOG_EVERY", "100"))
 RELEASE_PART_MAX_RELEASES: int = int(os.getenv("RELEASE_PART_MAX_RELEASES", "100000"))
 # Enable strict segment schema validation when set to a truthy value.
 # Disabled by default to reduce ingest overhead in production.
-VALIDATE_SEGMENTS: bool = os.getenv("VALIDATE_SEGMENTS", "").lower() in {
-    "1",
-    "true",
-    "yes",
-}
+VALIDATE_SEGMENTS: bool = _envbool("VALIDATE_SEGMENTS")
 
 
 def _load_category_min_sizes() -> dict[str, int]:
@@ -519,8 +632,14 @@ def min_size_for_release(norm_title: str, category: str) -> int:
     if override is not None:
         return override
 
+    return CATEGORY_MIN_SIZES.get(_base_category(category), 0)
+
+
+@lru_cache(maxsize=1024)
+def _base_category(category: str) -> str:
+    """Return the top-level category ID (e.g. ``"2000"``) for ``category``."""
+
     try:
-        base_cat = str(int(category) // 1000 * 1000)
+        return str(int(category) // 1000 * 1000)
     except Exception:
-        base_cat = "7000"  # fall back to "other"
-    return CATEGORY_MIN_SIZES.get(base_cat, 0)
+        return "7000"  # fall back to "other"
@@ -2,70 +2,105 @@
 
 from __future__ import annotations
 
+import atexit
+import contextlib
+import functools
 import logging
 import os  # used to ensure path exists for SQLite databases
 import sqlite3
-from typing import Any, Iterable, Tuple
+import threading
+from typing import Any, Iterable, Iterator, Tuple
 from urllib.parse import urlparse
 
-from .config import CURSOR_DB
-
-try:  # pragma: no cover - optional dependency
-    import psycopg
-except Exception:  # pragma: no cover - optional dependency
-    psycopg = None  # type: ignore
+from cachetools import TTLCache
 
+from .config import CURSOR_DB
 
 logger = logging.getLogger(__name__)
 
+# ``psycopg`` is imported on the first PostgreSQL connection so SQLite-only
+# deployments never pay for loading the driver.
+_psycopg: Any = None
 
-def _conn() -> Tuple[Any, str]:
-    """Return a database connection and its paramstyle."""
-    parsed = urlparse(CURSOR_DB)
-    if parsed.scheme.startswith("postgres"):
-        if not psycopg:  # pragma: no cover - missing driver
-            raise RuntimeError("psycopg is required for PostgreSQL URLs")
-        url = CURSOR_DB
-        if url.startswith("postgres://"):
-            url = url.replace("postgres://", "postgresql://", 1)
-        elif url.startswith("postgresql+"):
-            url = url.replace("postgresql+psycopg://", "postgresql://", 1)
-            url = url.replace("postgresql+asyncpg://", "postgresql://", 1)
-        conn = psycopg.connect(url)
-        paramstyle = "%s"
-    else:
-        os.makedirs(os.path.dirname(CURSOR_DB) or ".", exist_ok=True)
-        conn = sqlite3.connect(CURSOR_DB)
-        paramstyle = "?"
-    conn.execute(
-        'CREATE TABLE IF NOT EXISTS cursor ("group" TEXT PRIMARY KEY, last_article INTEGER, irrelevant INTEGER DEFAULT 0)'
-    )
-    conn.execute(
-        "CREATE TABLE IF NOT EXISTS cursor_meta (key TEXT PRIMARY KEY, value TEXT)"
-    )
-    conn.commit()
-    if parsed.scheme.startswith("postgres"):
+
+def _load_psycopg() -> Any:
+    """Return the ``psycopg`` module, importing it on first use."""
+    global _psycopg
+    if _psycopg is None:
         try:
-            conn.execute(
-                "ALTER TABLE cursor ADD COLUMN IF NOT EXISTS irrelevant INTEGER DEFAULT 0"
-            )
+            import psycopg
+        except Exception as exc:  # pragma: no cover - missing driver
+            raise RuntimeError("psycopg is required for PostgreSQL URLs") from exc
+        _psycopg = psycopg
+    return _psycopg
+
+
+# Hot statements are built once per paramstyle at import time so every call
+# reuses the same SQL text, which keeps SQLite's statement cache warm and lets
+# psycopg prepare them server-side.
+_PARAMSTYLES = ("?", "%s")
+_SQL_UPSERT = {
+    ps: 'INSERT INTO cursor("group", last_article, irrelevant) '
+    f"VALUES ({ps}, {ps}, 0) "
+    'ON CONFLICT("group") DO UPDATE SET last_article=excluded.last_article, irrelevant=0'
+    for ps in _PARAMSTYLES
+}
+_SQL_MARK_IRRELEVANT = {
+    ps: f'INSERT INTO cursor("group", last_article, irrelevant) VALUES ({ps}, 0, 1) '
+    'ON CONFLICT("group") DO UPDATE SET irrelevant=1'
+    for ps in _PARAMSTYLES
+}
+_SQL_SET_META = {
+    ps: f"INSERT INTO cursor_meta(key, value) VALUES ({ps}, {ps}) "
+    "ON CONFLICT(key) DO UPDATE SET value=excluded.value"
+    for ps in _PARAMSTYLES
+}
+_SQL_GET_PG = (
+    'SELECT "group", last_article FROM cursor '
+    'WHERE "group" = ANY(%s) AND irrelevant = 0'
+)
+_SQL_LIST_IRRELEVANT = 'SELECT "group" FROM cursor WHERE irrelevant = 1'
+# sqlite3 keeps a per-connection LRU of compiled statements keyed by SQL text.
+_SQLITE_CACHED_STATEMENTS = 256
+
+
+# Database URLs whose cursor schema has already been bootstrapped.
+_SCHEMA_READY: set[str] = set()
+
+
+_CREATE_TABLES_SQL = (
+    'CREATE TABLE IF NOT EXISTS cursor ("group" TEXT PRIMARY KEY, last_article INTEGER, irrelevant INTEGER DEFAULT 0); '
+    "CREATE TABLE IF NOT EXISTS cursor_meta (key TEXT PRIMARY KEY, value TEXT)"
+)
+# Concurrent ``CREATE TABLE IF NOT EXISTS`` can still fail on PostgreSQL with a
+# unique violation in the catalog, so processes starting together serialise
+# on a transaction-scoped advisory lock first.
+_PG_SCHEMA_SQL = (
+    "SELECT pg_advisory_xact_lock(hashtext('nzbidx_cursor_schema')); "
+    + _CREATE_TABLES_SQL
+    + "; ALTER TABLE cursor ADD COLUMN IF NOT EXISTS irrelevant INTEGER DEFAULT 0"
+)
+
+
+def _ensure_schema(conn: Any, postgres: bool) -> None:
+    """Create the cursor tables and add columns missing from older schemas."""
+    if postgres:
+        # psycopg accepts several statements in one parameterless execute, so
+        # the whole bootstrap is a single round-trip.
+        try:
+            conn.execute(_PG_SCHEMA_SQL)
             conn.commit()
         except Exception:  # pragma: no cover - unexpected schema issue
-            logging.exception(
-                "Unexpected error adding 'irrelevant' column to cursor table"
-            )
+            logging.exception("Unexpected error bootstrapping cursor tables")
             conn.rollback()
             raise
     else:
+        conn.executescript(_CREATE_TABLES_SQL)
         try:
-            cur = conn.execute("PRAGMA table_info(cursor)")
-            cols = [row[1] for row in cur.fetchall()]
-            if "irrelevant" not in cols:
-                conn.execute(
-                    "ALTER TABLE cursor ADD COLUMN irrelevant INTEGER DEFAULT 0"
-                )
-                conn.commit()
+            conn.execute("ALTER TABLE cursor ADD COLUMN irrelevant INTEGER DEFAULT 0")
+            conn.commit()
         except sqlite3.OperationalError:
+            # Column already exists.
             conn.rollback()
         except Exception:  # pragma: no cover - unexpected schema issue
             logging.exception(
@@ -73,17 +108,103 @@ def _conn() -> Tuple[Any, str]:
             )
             conn.rollback()
             raise
+
+
+@functools.lru_cache(maxsize=8)
+def _resolve_url(url: str) -> Tuple[bool, str]:
+    """Return whether ``url`` targets PostgreSQL and the URL to connect with.
+
+    ``CURSOR_DB`` rarely changes, so the parsing and driver-suffix rewriting
+    is done once per distinct value.
+    """
+    if not urlparse(url).scheme.startswith("postgres"):
+        return False, url
+    if url.startswith("postgres://"):
+        url = url.replace("postgres://", "postgresql://", 1)
+    elif url.startswith("postgresql+"):
+        url = url.replace("postgresql+psycopg://", "postgresql://", 1)
+        url = url.replace("postgresql+asyncpg://", "postgresql://", 1)
+    return True, url
+
+
+def _conn() -> Tuple[Any, str]:
+    """Return a database connection and its paramstyle."""
+    postgres, url = _resolve_url(CURSOR_DB)
+    if postgres:
+        psycopg = _load_psycopg()
+        conn = psycopg.connect(url)
+        paramstyle = "%s"
+    else:
+        if CURSOR_DB not in _SCHEMA_READY:
+            os.makedirs(os.path.dirname(CURSOR_DB) or ".", exist_ok=True)
+        conn = sqlite3.connect(CURSOR_DB, cached_statements=_SQLITE_CACHED_STATEMENTS)
+        # WAL lets readers proceed while a writer holds the lock and NORMAL
+        # only syncs at checkpoints, which is safe in WAL mode.
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        # A larger page cache avoids re-reading B-tree pages during bulk upserts.
+        conn.execute("PRAGMA cache_size=-65536")
+        # Serve reads from a memory map instead of read() syscalls and keep
+        # temporary B-trees (e.g. for IN-list lookups) off disk.
+        conn.execute("PRAGMA mmap_size=268435456")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        paramstyle = "?"
+    if CURSOR_DB not in _SCHEMA_READY:
+        _ensure_schema(conn, postgres)
+        _SCHEMA_READY.add(CURSOR_DB)
     return conn, paramstyle
 
 
+# Connections are cached per thread since SQLite connections may not be
+# shared across threads.
+_LOCAL = threading.local()
+
+
+def _get_conn() -> Tuple[Any, str]:
+    """Return this thread's cached connection, opening it on first use."""
+    cached = getattr(_LOCAL, "conn", None)
+    if cached is not None:
+        if _LOCAL.url == CURSOR_DB:
+            return cached
+        close_connection()
+    cached = _conn()
+    _LOCAL.conn = cached
+    _LOCAL.url = CURSOR_DB
+    return cached
+
+
+def close_connection() -> None:
+    """Close and forget the calling thread's cached connection, if any."""
+    cached = getattr(_LOCAL, "conn", None)
+    _LOCAL.conn = None
+    if cached is not None:
+        try:
+            cached[0].close()
+        except Exception:  # pragma: no cover - best effort cleanup
+            logger.debug("cursor_connection_close_failed", exc_info=True)
+
+
+atexit.register(close_connection)
+
+
+@contextlib.contextmanager
+def _connection() -> Iterator[Tuple[Any, str]]:
+    """Yield the cached connection, dropping it if the operation fails."""
+    conn, paramstyle = _get_conn()
+    try:
+        yield conn, paramstyle
+    except BaseException:
+        close_connection()
+        raise
+    # End any transaction implicitly opened by a read so the cached
+    # connection is not left idle in transaction on PostgreSQL.
+    conn.commit()
+
+
 def _set_group_mode(conn: Any, paramstyle: str, mode: str) -> None:
     """Persist the current group selection ``mode`` for cursor bookkeeping."""
 
-    stmt = (
-        f"INSERT INTO cursor_meta(key, value) VALUES ({paramstyle}, {paramstyle}) "
-        "ON CONFLICT(key) DO UPDATE SET value=excluded.value"
-    )
-    conn.execute(stmt, ("group_mode", mode))
+    conn.execute(_SQL_SET_META[paramstyle], ("group_mode", mode))
 
 
 def _get_group_mode(conn: Any) -> str | None:
@@ -94,59 +215,160 @@ def _get_group_mode(conn: Any) -> str | None:
     return row[0] if row else None
 
 
+# SQLite limits bound parameters per statement (999 on older builds), so the
+# IN-list lookup is split into chunks no larger than this.
+_SQLITE_IN_CHUNK = 512
+
+
+@functools.lru_cache(maxsize=None)
+def _select_cursors_sql(size: int) -> str:
+    """Return the SQLite cursor lookup for an IN-list of ``size`` placeholders."""
+    placeholders = "?," * (size - 1) + "?"
+    return (
+        f'SELECT "group", last_article FROM cursor '
+        f'WHERE "group" IN ({placeholders}) AND irrelevant = 0'
+    )
+
+
+def _bucket(size: int) -> int:
+    """Round ``size`` up to the next power of two."""
+    return 1 << (size - 1).bit_length()
+
+
 def get_cursors(groups: Iterable[str]) -> dict[str, int]:
     """Return the last processed article number for each ``group``."""
-    group_list = list(groups)
+    # Callers usually pass a list already; avoid copying it again since the
+    # SQLite path slices its own chunks and the Postgres path only reads it.
+    group_list = groups if isinstance(groups, list) else list(groups)
     if not group_list:
         return {}
-    conn, paramstyle = _conn()
-    placeholders = ",".join([paramstyle] * len(group_list))
-    cur = conn.execute(
-        f'SELECT "group", last_article FROM cursor WHERE "group" IN ({placeholders}) AND irrelevant = 0',
-        tuple(group_list),
-    )
-    rows = cur.fetchall()
-    conn.close()
+    with _connection() as (conn, paramstyle):
+        if paramstyle == "%s":
+            cur = conn.execute(_SQL_GET_PG, (group_list,), prepare=True)
+            rows = cur.fetchall()
+        else:
+            rows = []
+            for start in range(0, len(group_list), _SQLITE_IN_CHUNK):
+                chunk = group_list[start : start + _SQLITE_IN_CHUNK]
+                # Pad with a repeated group so only a handful of distinct
+                # statements are ever prepared and SQLite can reuse them.
+                size = _bucket(len(chunk))
+                chunk.extend([chunk[-1]] * (size - len(chunk)))
+                cur = conn.execute(_select_cursors_sql(size), chunk)
+                rows.extend(cur.fetchall())
+    # Both drivers return ``int`` for INTEGER columns; only coerce when the
+    # first row shows they did not (e.g. a TEXT column on a legacy table).
+    if rows and type(rows[0][1]) is int:
+        return dict(rows)
     return {row[0]: int(row[1]) for row in rows}
 
 
+# Lookups are served from memory for up to this many seconds.  Writes made
+# through this module update or invalidate the cached entries immediately;
+# the TTL only bounds staleness from writers in other processes.
+_CACHE_TTL = 60.0
+_CACHE_LOCK = threading.Lock()
+_CURSOR_CACHE: TTLCache[tuple[str, str], int | None] = TTLCache(
+    maxsize=65536, ttl=_CACHE_TTL
+)
+_IRRELEVANT_CACHE: TTLCache[str, list[str]] = TTLCache(maxsize=8, ttl=_CACHE_TTL)
+_MISSING = object()
+
+
+def _clear_caches() -> None:
+    """Forget every cached cursor and irrelevant-group lookup."""
+    with _CACHE_LOCK:
+        _CURSOR_CACHE.clear()
+        _IRRELEVANT_CACHE.clear()
+
+
 def get_cursor(group: str) -> int | None:
     """Return the last processed article number for ``group``."""
-    return get_cursors([group]).get(group)
+    key = (CURSOR_DB, group)
+    with _CACHE_LOCK:
+        cached = _CURSOR_CACHE.get(key, _MISSING)
+    if cached is not _MISSING:
+        return cached
+    value = get_cursors([group]).get(group)
+    with _CACHE_LOCK:
+        _CURSOR_CACHE[key] = value
+    return value
+
+
+# Whether cursors of a given connection class support the context manager
+# protocol (psycopg does, sqlite3 does not), resolved once per class.
+_CURSOR_IS_CM: dict[type, bool] = {}
+
+
+def _executemany(conn: Any, stmt: str, params: Iterable[Any]) -> None:
+    """Run ``stmt`` for each entry of ``params`` on a short-lived cursor."""
+    is_cm = _CURSOR_IS_CM.get(type(conn))
+    cur = conn.cursor()
+    if is_cm is None:
+        is_cm = hasattr(cur, "__enter__") and hasattr(cur, "__exit__")
+        _CURSOR_IS_CM[type(conn)] = is_cm
+    if is_cm:
+        with cur:
+            cur.executemany(stmt, params)
+    else:
+        try:
+            cur.executemany(stmt, params)
+        finally:
+            cur.close()
+
+
+# Postgres batches larger than this are bulk loaded with COPY into a staging
+# table and merged with a single upsert instead of one statement per row.
+_COPY_THRESHOLD = 512
+
+
+def _copy_cursors(conn: Any, updates: dict[str, int]) -> None:
+    """Upsert ``updates`` on Postgres via ``COPY`` into a temporary table."""
+    with conn.cursor() as cur:
+        cur.execute(
+            "CREATE TEMP TABLE IF NOT EXISTS cursor_stage "
+            '("group" TEXT, last_article INTEGER) ON COMMIT DROP'
+        )
+        with cur.copy('COPY cursor_stage ("group", last_article) FROM STDIN') as cp:
+            for row in updates.items():
+                cp.write_row(row)
+        cur.execute(
+            'INSERT INTO cursor("group", last_article, irrelevant) '
+            'SELECT "group", last_article, 0 FROM cursor_stage '
+            'ON CONFLICT("group") DO UPDATE SET last_article=excluded.last_article, irrelevant=0'
+        )
 
 
 def set_cursors(updates: dict[str, int]) -> None:
     """Persist ``last_article`` cursors for multiple groups."""
     if not updates:
         return
-    conn, paramstyle = _conn()
-    stmt = (
-        f'INSERT INTO cursor("group", last_article, irrelevant) '
-        f"VALUES ({paramstyle}, {paramstyle}, 0) "
-        'ON CONFLICT("group") DO UPDATE SET last_article=excluded.last_article, irrelevant=0'
-    )
     errors: tuple[type[Exception], ...]
-    if psycopg:
-        errors = (sqlite3.OperationalError, psycopg.Error)
-    else:  # pragma: no cover - optional dependency
-        errors = (sqlite3.OperationalError,)
-    try:
+    with _connection() as (conn, paramstyle):
+        if _psycopg is not None:
+            errors = (sqlite3.OperationalError, _psycopg.Error)
+        else:
+            errors = (sqlite3.OperationalError,)
         try:
-            with conn.cursor() as cur:
-                cur.executemany(stmt, [(g, c) for g, c in updates.items()])
-        except (AttributeError, TypeError):
-            cur = conn.cursor()
-            try:
-                cur.executemany(stmt, [(g, c) for g, c in updates.items()])
-            finally:
-                cur.close()
-        conn.commit()
-    except errors as exc:
-        logger.exception("cursor_update_failed")
-        conn.rollback()
-        raise RuntimeError("Failed to set cursors") from exc
-    finally:
-        conn.close()
+            if paramstyle == "?":
+                # Take the write lock up front so the whole batch lands in a
+                # single transaction and is synced to disk once on commit.
+                conn.execute("BEGIN IMMEDIATE")
+            if paramstyle == "%s" and len(updates) > _COPY_THRESHOLD:
+                _copy_cursors(conn, updates)
+            else:
+                _executemany(conn, _SQL_UPSERT[paramstyle], updates.items())
+            conn.commit()
+        except errors as exc:
+            logger.exception("cursor_update_failed")
+            conn.rollback()
+            raise RuntimeError("Failed to set cursors") from exc
+    url = CURSOR_DB
+    with _CACHE_LOCK:
+        for group, last_article in updates.items():
+            _CURSOR_CACHE[(url, group)] = last_article
+        # The upsert clears the irrelevant flag for these groups.
+        _IRRELEVANT_CACHE.pop(url, None)
 
 
 def set_cursor(group: str, last_article: int) -> None:
@@ -154,32 +376,58 @@ def set_cursor(group: str, last_article: int) -> None:
     set_cursors({group: last_article})
 
 
+def mark_irrelevant_many(groups: Iterable[str]) -> None:
+    """Mark every group in ``groups`` as irrelevant in a single transaction."""
+    params = [(g,) for g in groups]
+    if not params:
+        return
+    with _connection() as (conn, paramstyle):
+        _executemany(conn, _SQL_MARK_IRRELEVANT[paramstyle], params)
+        conn.commit()
+    url = CURSOR_DB
+    with _CACHE_LOCK:
+        for (group,) in params:
+            _CURSOR_CACHE[(url, group)] = None
+        _IRRELEVANT_CACHE.pop(url, None)
+
+
 def mark_irrelevant(group: str) -> None:
     """Mark ``group`` as irrelevant to skip future processing."""
-    conn, paramstyle = _conn()
-    conn.execute(
-        f'INSERT INTO cursor("group", last_article, irrelevant) VALUES ({paramstyle}, 0, 1) '
-        'ON CONFLICT("group") DO UPDATE SET irrelevant=1',
-        (group,),
-    )
-    conn.commit()
-    conn.close()
+    mark_irrelevant_many([group])
+
+
+def _first_column(_cursor: sqlite3.Cursor, row: tuple) -> Any:
+    """SQLite row factory returning only the first column."""
+    return row[0]
 
 
 def get_irrelevant_groups() -> list[str]:
     """Return all groups marked as irrelevant."""
-    conn, _ = _conn()
-    cur = conn.execute('SELECT "group" FROM cursor WHERE irrelevant = 1')
-    rows = cur.fetchall()
-    conn.close()
-    return [row[0] for row in rows]
+    url = CURSOR_DB
+    with _CACHE_LOCK:
+        cached = _IRRELEVANT_CACHE.get(url)
+    if cached is not None:
+        return list(cached)
+    with _connection() as (conn, paramstyle):
+        if paramstyle == "%s":
+            cur = conn.execute(_SQL_LIST_IRRELEVANT, prepare=True)
+            # Stream the rows rather than materialising them with fetchall().
+            groups = [group for (group,) in cur]
+        else:
+            # Have SQLite hand back the group names directly instead of
+            # allocating a one-element tuple per row.
+            cur = conn.cursor()
+            cur.row_factory = _first_column
+            groups = cur.execute(_SQL_LIST_IRRELEVANT).fetchall()
+    with _CACHE_LOCK:
+        _IRRELEVANT_CACHE[url] = groups
+    return list(groups)
 
 
 def reset(allowed: Iterable[str] | None = None) -> None:
     """Reset cursor state, optionally keeping entries for ``allowed`` groups."""
 
-    conn, paramstyle = _conn()
-    try:
+    with _connection() as (conn, paramstyle):
         if allowed:
             allowed_set = sorted({g for g in allowed if g})
         else:
@@ -187,14 +435,13 @@ def reset(allowed: Iterable[str] | None = None) -> None:
         if not allowed_set:
             conn.execute("DELETE FROM cursor")
         else:
-            placeholders = ",".join([paramstyle] * len(allowed_set))
+            placeholders = f"{paramstyle}," * (len(allowed_set) - 1) + paramstyle
             conn.execute(
                 f'DELETE FROM cursor WHERE "group" NOT IN ({placeholders})',
-                tuple(allowed_set),
+                allowed_set,
             )
         conn.commit()
-    finally:
-        conn.close()
+    _clear_caches()
 
 
 def reset_for_curated() -> bool:
@@ -203,25 +450,20 @@ def reset_for_curated() -> bool:
     Returns ``True`` if a reset occurred.
     """
 
-    conn, paramstyle = _conn()
-    try:
+    with _connection() as (conn, paramstyle):
         current = _get_group_mode(conn)
         if current == "curated":
             return False
         conn.execute("DELETE FROM cursor")
         _set_group_mode(conn, paramstyle, "curated")
         conn.commit()
-        return True
-    finally:
-        conn.close()
+    _clear_caches()
+    return True
 
 
 def mark_group_mode(mode: str) -> None:
     """Record the active group selection ``mode`` without mutating cursors."""
 
-    conn, paramstyle = _conn()
-    try:
+    with _connection() as (conn, paramstyle):
         _set_group_mode(conn, paramstyle, mode)
         conn.commit()
-    finally:
-        conn.close()
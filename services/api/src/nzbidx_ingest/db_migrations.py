@@ -6,6 +6,7 @@ import logging
 import os
 import re
 from datetime import datetime, date, timezone
+from functools import lru_cache
 from typing import Any, Iterable
 
 logger = logging.getLogger(__name__)
@@ -22,6 +23,11 @@ CATEGORY_RANGES: dict[str, tuple[int, int] | None] = {
     "other": None,
 }
 
+# Categories with explicit bounds; each is further partitioned by ``posted_at``.
+DATED_CATEGORIES: tuple[str, ...] = tuple(
+    name for name, bounds in CATEGORY_RANGES.items() if bounds is not None
+)
+
 _PARTITION_RANGE_RE = re.compile(r"FROM \('([^']+)'\) TO \('([^']+)'\)")
 
 
@@ -40,9 +46,371 @@ def _format_partition_bound(value: int | str) -> str:
     raise TypeError("partition bounds must be int or str")
 
 
+def _execute_each(cur: Any, statements: Iterable[str]) -> None:
+    """Execute ``statements`` one at a time.
+
+    The API passes in SQLAlchemy's asyncpg adapter, which prepares every
+    statement, and PostgreSQL cannot prepare more than one command, so
+    statements are never sent joined into a script.
+    """
+
+    for statement in statements:
+        cur.execute(statement)
+
+
+def _category_bounds_sql(category: str) -> str:
+    """Return the partition bound clause of ``release_<category>``.
+
+    Bounded categories get ``FOR VALUES FROM (...) TO (...)`` while the
+    category without bounds is the ``DEFAULT`` partition.
+    """
+
+    bounds = CATEGORY_RANGES[category]
+    if bounds is None:
+        return "DEFAULT"
+    start, end = (_format_partition_bound(b) for b in bounds)
+    return f"FOR VALUES FROM ({start}) TO ({end})"
+
+
+# Optional overrides of the memory and parallel workers given to index builds
+# during migrations.  Each parallel worker may use ``maintenance_work_mem``, so
+# the server's own values are kept unless these are set.
+MIGRATION_MAINTENANCE_WORK_MEM = os.getenv("MIGRATION_MAINTENANCE_WORK_MEM", "").strip()
+MIGRATION_MAX_PARALLEL_MAINTENANCE_WORKERS = os.getenv(
+    "MIGRATION_MAX_PARALLEL_MAINTENANCE_WORKERS", ""
+).strip()
+
+_MEMORY_SETTING_RE = re.compile(r"\d+\s*(?:[kMGT]B)?")
+
+
+def _bulk_load_settings_sql() -> str:
+    """Return the ``DO`` block applying the bulk-load session settings.
+
+    A crash simply restarts the idempotent migration, so commits need not
+    wait for the WAL flush, and index builds use any configured memory and
+    worker overrides; invalid overrides are ignored with a warning.  Rows
+    moved into partitions that already carry GIN indexes queue up in a
+    larger pending list instead of flushing it every few megabytes.  Rows
+    being moved already satisfy their constraints, so trigger and foreign key
+    firing is skipped, and full-page WAL images are compressed, where the
+    role is allowed to change those settings.  Everything is applied by one
+    ``DO`` block since the asyncpg adapter cannot run several commands in
+    one statement; ``set_config(..., true)`` is the function form of ``SET
+    LOCAL``.
+    """
+
+    settings = [("synchronous_commit", "off")]
+    mem = MIGRATION_MAINTENANCE_WORK_MEM
+    if mem and _MEMORY_SETTING_RE.fullmatch(mem):
+        settings.append(("maintenance_work_mem", mem))
+    elif mem:
+        logger.warning("ignoring invalid MIGRATION_MAINTENANCE_WORK_MEM %r", mem)
+    workers = MIGRATION_MAX_PARALLEL_MAINTENANCE_WORKERS
+    if workers.isdigit():
+        settings.append(("max_parallel_maintenance_workers", str(int(workers))))
+    elif workers:
+        logger.warning(
+            "ignoring invalid MIGRATION_MAX_PARALLEL_MAINTENANCE_WORKERS %r", workers
+        )
+    settings += [("gin_pending_list_limit", "64MB"), ("client_min_messages", "warning")]
+    calls = "".join(
+        f"\n        PERFORM set_config('{name}', '{value}', true);"
+        for name, value in settings
+    )
+    return f"""
+    DO $$
+    BEGIN{calls}
+        BEGIN
+            PERFORM set_config('session_replication_role', 'replica', true);
+            PERFORM set_config('wal_compression', 'on', true);
+        EXCEPTION WHEN insufficient_privilege THEN NULL;
+        END;
+    END$$
+""".strip()
+
+
+# Session settings applied to each migration transaction.
+_BULK_LOAD_SETTINGS_SQL = _bulk_load_settings_sql()
+
+
+# Prepares the unpartitioned ``release`` table in a short transaction of its
+# own: the partition key columns are added and backfilled, and its indexes are
+# renamed out of the way so the partitioned replacement can take their names.
+# Missing columns are looked up first and added in one ``ALTER TABLE``, so a
+# re-run does not take the exclusive lock at all.
+_PREPARE_RELEASE_STATEMENTS = (
+    _BULK_LOAD_SETTINGS_SQL,
+    """
+    DO $$
+    DECLARE cols text;
+    BEGIN
+        SELECT string_agg(format('ADD COLUMN %I %s', c.name, c.type), ', ')
+        INTO cols
+        FROM (
+            VALUES ('category_id', 'INT'), ('posted_at', 'TIMESTAMPTZ'),
+                ('extension', 'TEXT')
+        ) AS c(name, type)
+        WHERE NOT EXISTS (
+            SELECT 1 FROM pg_attribute a
+            WHERE a.attrelid = 'release'::regclass
+                AND a.attname = c.name AND NOT a.attisdropped
+        );
+        IF cols IS NOT NULL THEN
+            EXECUTE 'ALTER TABLE release ' || cols;
+        END IF;
+    END$$
+    """.strip(),
+    "UPDATE release SET category_id = NULLIF(category, '')::INT "
+    "WHERE category_id IS NULL AND category ~ '^[0-9]+'",
+    """
+    DO $$
+    DECLARE idx text;
+    BEGIN
+        FOR idx IN
+            SELECT c.relname
+            FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid
+            WHERE i.indrelid = 'release'::regclass
+                AND c.relname NOT LIKE 'legacy\\_%'
+        LOOP
+            EXECUTE format('ALTER INDEX %I RENAME TO %I', idx, 'legacy_' || idx);
+        END LOOP;
+    END$$
+    """.strip(),
+)
+
+
+def _partition_release_statements() -> tuple[str, ...]:
+    """Return the statements creating the partitioned ``release_new`` table.
+
+    The table is built alongside the live ``release`` table, which stays
+    readable and writable until it is swapped out.
+    """
+
+    statements = [
+        _BULK_LOAD_SETTINGS_SQL,
+        """
+        CREATE TABLE release_new (
+            LIKE release INCLUDING DEFAULTS INCLUDING GENERATED
+            INCLUDING STORAGE INCLUDING COMMENTS
+        ) PARTITION BY RANGE (category_id)
+        """.strip(),
+    ]
+    for name, bounds in CATEGORY_RANGES.items():
+        table = f"release_{name}"
+        bounds_sql = _category_bounds_sql(name)
+        if bounds is None:
+            statements.append(
+                f"CREATE TABLE IF NOT EXISTS {table} PARTITION OF release_new {bounds_sql}"
+            )
+            continue
+        statements.extend(
+            [
+                f"CREATE TABLE IF NOT EXISTS {table} PARTITION OF release_new {bounds_sql} PARTITION BY RANGE (posted_at)",
+                f"CREATE TABLE IF NOT EXISTS {table}_2024 PARTITION OF {table} FOR VALUES FROM ('2024-01-01') TO ('2025-01-01')",
+                f"CREATE TABLE IF NOT EXISTS {table}_default PARTITION OF {table} DEFAULT",
+            ]
+        )
+    return tuple(statements)
+
+
+_PARTITION_RELEASE_STATEMENTS = _partition_release_statements()
+
+# Unique constraint and secondary indexes on the partitioned table.  They are
+# built once the rows have been copied since a single bulk build, GIN in
+# particular, is far cheaper than maintaining the index row by row during the
+# copy.
+_RELEASE_INDEX_STATEMENTS = (
+    # Enforce uniqueness on norm_title/category_id/posted_at across partitions.
+    "ALTER TABLE release_new ADD CONSTRAINT release_norm_title_category_id_posted_at_key UNIQUE (norm_title, category_id, posted_at)",
+    "CREATE INDEX release_norm_title_idx ON release_new USING GIN (norm_title gin_trgm_ops)",
+    "CREATE INDEX release_tags_idx ON release_new USING GIN (tags gin_trgm_ops)",
+    "CREATE INDEX release_posted_at_idx ON release_new (posted_at)",
+)
+
+
+_RELEASE_COLUMNS = (
+    "id, norm_title, category, category_id, language, tags, source_group, "
+    "size_bytes, posted_at, segments, has_parts, part_count"
+)
+
+
+# Number of row batches moved between commits in
+# :func:`migrate_release_partitions_by_date`.
+_MIGRATE_COMMIT_BATCHES = 10
+
+
+def _release_partition_filters() -> tuple[tuple[str, str], ...]:
+    """Return ``(partition, predicate)`` pairs covering every ``release`` row.
+
+    Each predicate selects the rows belonging to that category partition; the
+    default partition receives everything outside the ranges, including rows
+    without a ``category_id``.
+    """
+
+    filters: list[tuple[str, str]] = []
+    bounded: list[str] = []
+    default: str | None = None
+    for name, bounds in CATEGORY_RANGES.items():
+        if bounds is None:
+            default = f"release_{name}"
+            continue
+        start, end = (_format_partition_bound(b) for b in bounds)
+        predicate = f"category_id >= {start} AND category_id < {end}"
+        bounded.append(f"({predicate})")
+        filters.append((f"release_{name}", predicate))
+    if default is not None:
+        outside = f" OR NOT ({' OR '.join(bounded)})" if bounded else ""
+        filters.append((default, f"category_id IS NULL{outside}"))
+    return tuple(filters)
+
+
+_RELEASE_PARTITION_FILTERS = _release_partition_filters()
+
+
+def _copy_release_statements(high_water: int) -> tuple[str, ...]:
+    """Return the server-side copy of ``release`` into every partition.
+
+    ``release`` is locked in ``SHARE`` mode first and stays locked until the
+    swap, so readers carry on but no update or delete made after the copy
+    can be lost when the old table is dropped.  Only rows up to
+    ``high_water`` are copied; rows inserted before the lock was granted are
+    caught up when the tables are swapped.
+    """
+
+    return ("LOCK TABLE release IN SHARE MODE",) + tuple(
+        f"INSERT INTO {table} ({_RELEASE_COLUMNS}) "
+        f"SELECT {_RELEASE_COLUMNS} FROM release "
+        f"WHERE id <= {int(high_water)} AND ({where})"
+        for table, where in _RELEASE_PARTITION_FILTERS
+    )
+
+
+def _probe_legacy_release(cur: Any) -> tuple[str | None, int]:
+    """Return the single category of the ``release`` rows and the highest id.
+
+    The category is ``None`` when the table is empty, has rows without a
+    ``category_id`` or spans more than one category range.  The highest id
+    is ``0`` for an empty table.
+    """
+
+    cur.execute(
+        "SELECT min(category_id), max(category_id), "
+        "count(*) FILTER (WHERE category_id IS NULL), max(id) FROM release"
+    )
+    row = cur.fetchone()
+    if not row:
+        return None, 0
+    low, high, missing, high_water = row
+    high_water = int(high_water or 0)
+    if low is None or missing:
+        return None, high_water
+    for name in DATED_CATEGORIES:
+        start, end = CATEGORY_RANGES[name]
+        if start <= low and high < end:
+            return name, high_water
+    return None, high_water
+
+
+def _attach_release_statements(category: str) -> tuple[str, ...]:
+    """Return the statements attaching ``release`` as ``category``'s default.
+
+    A validated ``CHECK`` matching the partition bounds lets ``ATTACH
+    PARTITION`` skip its own scan.  The freshly created, empty date
+    partitions of ``category`` are dropped so every row of the old table
+    satisfies the default partition's constraint, and ``release_new`` takes
+    over the ``release`` name.
+    """
+
+    start, end = (_format_partition_bound(b) for b in CATEGORY_RANGES[category])
+    table = f"release_{category}"
+    return (
+        "LOCK TABLE release IN ACCESS EXCLUSIVE MODE",
+        "ALTER TABLE release ADD CONSTRAINT release_legacy_cat_chk "
+        f"CHECK (category_id IS NOT NULL AND category_id >= {start} "
+        f"AND category_id < {end}) NOT VALID",
+        "ALTER TABLE release VALIDATE CONSTRAINT release_legacy_cat_chk",
+        f"DROP TABLE {table}_2024, {table}_default",
+        f"ALTER TABLE release RENAME TO {table}_default",
+        "ALTER TABLE release_new RENAME TO release",
+        f"ALTER TABLE {table} ATTACH PARTITION {table}_default DEFAULT",
+        f"ALTER TABLE {table}_default DROP CONSTRAINT release_legacy_cat_chk",
+    )
+
+
+def _attach_legacy_release(cur: Any, category: str) -> bool:
+    """Attach ``release`` as a partition instead of copying its rows.
+
+    Any failure, such as rows of another category written since the probe,
+    is rolled back to a savepoint and ``False`` is returned so the caller
+    copies the rows instead.
+    """
+
+    cur.execute("SAVEPOINT release_attach")
+    try:
+        # The partitioned indexes are built while still empty; attaching
+        # reuses matching indexes of the old table or builds the rest.
+        _execute_each(cur, _RELEASE_INDEX_STATEMENTS)
+        _execute_each(cur, _attach_release_statements(category))
+    except Exception as exc:
+        cur.execute("ROLLBACK TO SAVEPOINT release_attach")
+        logger.info(
+            "attaching release to %s failed; copying rows instead: %s",
+            category,
+            exc,
+        )
+        return False
+    cur.execute("RELEASE SAVEPOINT release_attach")
+    return True
+
+
+def _swap_release_statements(high_water: int) -> tuple[str, ...]:
+    """Return the statements promoting the loaded ``release_new``.
+
+    Rows written after ``high_water`` was read are caught up under the lock,
+    and the id sequence is handed over before the old table is dropped.
+    """
+
+    return (
+        "LOCK TABLE release IN ACCESS EXCLUSIVE MODE",
+        f"INSERT INTO release_new ({_RELEASE_COLUMNS}) "
+        f"SELECT {_RELEASE_COLUMNS} FROM release WHERE id > {int(high_water)}",
+        """
+        DO $$
+        DECLARE seq text := pg_get_serial_sequence('release', 'id');
+        BEGIN
+            IF seq IS NOT NULL THEN
+                EXECUTE format('ALTER SEQUENCE %s OWNED BY release_new.id', seq);
+            END IF;
+        END$$
+        """.strip(),
+        "DROP TABLE release",
+        "ALTER TABLE release_new RENAME TO release",
+    )
+
+
+def _analyze_release_statements(table: str) -> tuple[str, str]:
+    """Return the statements refreshing planner statistics for ``table``.
+
+    Freshly loaded partitions have no statistics until autovacuum gets to
+    them, so they are analysed straight away.  ``ANALYZE`` on a partitioned
+    table recurses into its partitions, and the hot filter columns get a
+    larger statistics target.
+    """
+
+    return (
+        f"ALTER TABLE {table} ALTER COLUMN norm_title SET STATISTICS 1000, "
+        "ALTER COLUMN category_id SET STATISTICS 1000",
+        f"ANALYZE {table}",
+    )
+
+
 def migrate_release_table(conn: Any) -> None:
     """Migrate ``release`` rows into partitioned tables by ``category_id``.
 
+    The partitioned replacement is loaded next to the live table.  Writers
+    wait while the rows are copied, but readers are only blocked by the
+    exclusive lock taken for the final catalog swap.
+
     This function is idempotent.  If the ``release`` table does not exist or is
     already partitioned, no action is taken.
     """
@@ -65,130 +433,150 @@ def migrate_release_table(conn: Any) -> None:
     if partrelid is not None:
         return
 
-    # Prepare data for partitioning.
-    cur.execute(
-        "ALTER TABLE IF EXISTS release ADD COLUMN IF NOT EXISTS category_id INT",
-    )
-    cur.execute(
-        "ALTER TABLE IF EXISTS release ADD COLUMN IF NOT EXISTS posted_at TIMESTAMPTZ",
-    )
-    cur.execute(
-        "ALTER TABLE IF EXISTS release ADD COLUMN IF NOT EXISTS extension TEXT",
-    )
-    cur.execute(
-        "UPDATE release SET category_id = NULLIF(category, '')::INT "
-        "WHERE category_id IS NULL AND category ~ '^[0-9]+'",
-    )
+    _forget_partitions()
+    # Backfill the partition key in its own short transaction, then create
+    # the partitioned replacement with its partitions.
+    _execute_each(cur, _PREPARE_RELEASE_STATEMENTS)
+    conn.commit()
+    _execute_each(cur, _PARTITION_RELEASE_STATEMENTS)
+
+    # When the rows all fall inside one category range the table is attached
+    # as a partition in place; otherwise copy rows straight into each
+    # category partition so the parent's tuple router is bypassed.
+    category, high_water = _probe_legacy_release(cur)
+    if category is None or not _attach_legacy_release(cur, category):
+        _execute_each(cur, _copy_release_statements(high_water))
+        # Build the indexes over the loaded data, then swap the tables.
+        _execute_each(cur, _RELEASE_INDEX_STATEMENTS)
+        _execute_each(cur, _swap_release_statements(high_water))
 
-    # Rename existing table and create partitioned replacement.
-    cur.execute("ALTER TABLE release RENAME TO release_old")
-    cur.execute(
-        """
-        CREATE TABLE release (
-            LIKE release_old INCLUDING DEFAULTS
-            INCLUDING STORAGE INCLUDING COMMENTS
-        ) PARTITION BY RANGE (category_id)
+    conn.commit()
+    create_release_posted_at_index(conn)
+    _execute_each(cur, _analyze_release_statements("release"))
+    conn.commit()
+
+
+def _move_batch_sql(table: str, batch_size: int, where: str) -> str:
+    """Return the statement copying one batch of ``{table}_old`` rows."""
+
+    return f"""
+        WITH moved AS (
+            SELECT {_RELEASE_COLUMNS} FROM {table}_old {where}
+            ORDER BY id LIMIT {batch_size}
+        )
+        , inserted AS (
+            INSERT INTO {table} (
+                {_RELEASE_COLUMNS}
+            )
+            SELECT
+                {_RELEASE_COLUMNS}
+            FROM moved
+        )
+        SELECT max(id) FROM moved
         """
-    )
 
-    # Create partitions.
-    cur.execute(
-        "CREATE TABLE IF NOT EXISTS release_movies PARTITION OF release FOR VALUES FROM (2000) TO (3000) PARTITION BY RANGE (posted_at)",
-    )
-    cur.execute(
-        "CREATE TABLE IF NOT EXISTS release_movies_2024 PARTITION OF release_movies FOR VALUES FROM ('2024-01-01') TO ('2025-01-01')",
-    )
-    cur.execute(
-        "CREATE TABLE IF NOT EXISTS release_movies_default PARTITION OF release_movies DEFAULT",
-    )
-    cur.execute(
-        "CREATE TABLE IF NOT EXISTS release_music PARTITION OF release FOR VALUES FROM (3000) TO (4000) PARTITION BY RANGE (posted_at)",
-    )
-    cur.execute(
-        "CREATE TABLE IF NOT EXISTS release_music_2024 PARTITION OF release_music FOR VALUES FROM ('2024-01-01') TO ('2025-01-01')",
-    )
-    cur.execute(
-        "CREATE TABLE IF NOT EXISTS release_music_default PARTITION OF release_music DEFAULT",
-    )
-    cur.execute(
-        "CREATE TABLE IF NOT EXISTS release_tv PARTITION OF release FOR VALUES FROM (5000) TO (6000) PARTITION BY RANGE (posted_at)",
-    )
-    cur.execute(
-        "CREATE TABLE IF NOT EXISTS release_tv_2024 PARTITION OF release_tv FOR VALUES FROM ('2024-01-01') TO ('2025-01-01')",
-    )
-    cur.execute(
-        "CREATE TABLE IF NOT EXISTS release_tv_default PARTITION OF release_tv DEFAULT",
-    )
-    cur.execute(
-        "CREATE TABLE IF NOT EXISTS release_adult PARTITION OF release FOR VALUES FROM (6000) TO (7000) PARTITION BY RANGE (posted_at)",
-    )
-    cur.execute(
-        "CREATE TABLE IF NOT EXISTS release_adult_2024 PARTITION OF release_adult FOR VALUES FROM ('2024-01-01') TO ('2025-01-01')",
-    )
-    cur.execute(
-        "CREATE TABLE IF NOT EXISTS release_adult_default PARTITION OF release_adult DEFAULT",
-    )
-    cur.execute(
-        "CREATE TABLE IF NOT EXISTS release_books PARTITION OF release FOR VALUES FROM (7000) TO (8000) PARTITION BY RANGE (posted_at)",
-    )
-    cur.execute(
-        "CREATE TABLE IF NOT EXISTS release_books_2024 PARTITION OF release_books FOR VALUES FROM ('2024-01-01') TO ('2025-01-01')",
-    )
-    cur.execute(
-        "CREATE TABLE IF NOT EXISTS release_books_default PARTITION OF release_books DEFAULT",
-    )
-    cur.execute(
-        "CREATE TABLE IF NOT EXISTS release_other PARTITION OF release DEFAULT",
-    )
 
-    # Enforce uniqueness on norm_title/category_id/posted_at across partitions.
-    cur.execute(
-        "ALTER TABLE release ADD CONSTRAINT release_norm_title_category_id_posted_at_key UNIQUE (norm_title, category_id, posted_at)",
-    )
+def _move_rows_in_batches(
+    conn: Any, cur: Any, table: str, batch_size: int, last_id: int | None = None
+) -> None:
+    """Copy ``{table}_old`` rows into ``table`` ``batch_size`` rows at a time.
+
+    The old table is dropped once every row has been copied, so batches are
+    not deleted from it; each one pages forward from the last id copied
+    through an index on ``id`` built up front.  ``last_id`` resumes after
+    rows an earlier run already copied.  Only the highest id copied is sent
+    back, and the statement text is built once so every batch after the
+    first reuses the same prepared statement.
+    """
 
-    # Recreate indexes on the new table.
-    cur.execute(
-        "CREATE INDEX release_norm_title_idx ON release USING GIN (norm_title gin_trgm_ops)",
-    )
-    cur.execute(
-        "CREATE INDEX release_tags_idx ON release USING GIN (tags gin_trgm_ops)",
-    )
+    cur.execute(f"CREATE INDEX IF NOT EXISTS {table}_old_id_idx ON {table}_old (id)")
+    first = _move_batch_sql(table, batch_size, "")
+    resume = _move_batch_sql(table, batch_size, "WHERE id > $1")
+    batches = 0
+    while True:
+        if last_id is None:
+            cur.execute(first)
+        else:
+            cur.execute(resume, (last_id,))
+        row = cur.fetchone()
+        if not row or row[0] is None:
+            break
+        last_id = row[0]
+        batches += 1
+        if batches % _MIGRATE_COMMIT_BATCHES == 0:
+            conn.commit()
+            cur.execute(_BULK_LOAD_SETTINGS_SQL)
+
+
+def _finish_release_move(
+    conn: Any, cur: Any, table: str, batch_size: int, last_id: int | None = None
+) -> None:
+    """Move the remaining ``{table}_old`` rows into ``table`` and drop it."""
+
+    cur.execute(_BULK_LOAD_SETTINGS_SQL)
+    _move_rows_in_batches(conn, cur, table, batch_size, last_id)
+    cur.execute(f"DROP TABLE {table}_old")
+    _execute_each(cur, _analyze_release_statements(table))
+    conn.commit()
+
+
+def _resume_release_move(conn: Any, cur: Any, table: str, batch_size: int) -> None:
+    """Finish a date migration of ``table`` that stopped while moving rows.
+
+    Batches are committed as they go, so an interrupted run leaves ``table``
+    partitioned with the tail of its rows still in ``{table}_old``.  Rows
+    written since the migration started have ids above every old row, so
+    the highest id copied is the largest one not above the old table's.
+    """
+
+    cur.execute("SELECT 1 FROM pg_class WHERE relname = $1", (f"{table}_old",))
+    if not cur.fetchall():
+        return
     cur.execute(
-        "CREATE INDEX release_posted_at_idx ON release (posted_at)",
+        f"SELECT max(id) FROM {table} WHERE id <= (SELECT max(id) FROM {table}_old)"
     )
+    row = cur.fetchone()
+    last_id = row[0] if row else None
+    logger.info("resuming release row move into %s after id %s", table, last_id)
+    _finish_release_move(conn, cur, table, batch_size, last_id)
 
-    create_release_posted_at_index(conn)
 
-    # Copy rows and drop the old table.
-    cur.execute(
-        """
-        INSERT INTO release (
-            id, norm_title, category, category_id, language, tags, source_group,
-            size_bytes, posted_at, segments, has_parts, part_count
+def _posted_at_years_sql(table: str) -> str:
+    """Return a query listing the ``posted_at`` years present in ``table``.
+
+    Each step seeks the first row of a later year, so the ``posted_at``
+    index answers it without aggregating the whole table.  Years without
+    rows are skipped, so one stray date far in the past adds a single year
+    rather than every year up to the rest of the data.
+    """
+
+    return f"""
+        WITH RECURSIVE years(y) AS (
+            SELECT EXTRACT(YEAR FROM min(posted_at))::int FROM {table}
+            UNION ALL
+            SELECT (
+                SELECT EXTRACT(YEAR FROM min(posted_at))::int FROM {table}
+                WHERE posted_at >= make_date(y, 1, 1) + interval '1 year'
+            )
+            FROM years
+            WHERE y IS NOT NULL
         )
-        SELECT
-            id, norm_title, category, category_id, language, tags, source_group,
-            size_bytes, posted_at, segments, has_parts, part_count
-        FROM release_old
+        SELECT y FROM years WHERE y IS NOT NULL
         """
-    )
-    cur.execute("DROP TABLE release_old")
-
-    conn.commit()
 
 
 def migrate_release_partitions_by_date(
-    conn: Any, category: str, batch_size: int = 1000
+    conn: Any, category: str, batch_size: int = 50_000
 ) -> None:
     """Ensure ``release_<category>`` is partitioned by ``posted_at``.
 
     The function converts the existing category partition into a partitioned
     table by ``posted_at`` and migrates any existing rows into yearly child
-    partitions.  It is safe to call multiple times.
+    partitions.  It is safe to call multiple times, and a run interrupted
+    while moving rows is finished by the next call.
     """
 
     table = f"release_{category}"
-    ranges = CATEGORY_RANGES.get(category)
     if category not in CATEGORY_RANGES:
         raise ValueError(f"unknown category: {category}")
 
@@ -200,71 +588,142 @@ def migrate_release_partitions_by_date(
         (table,),
     )
     if cur.fetchone() is not None:
+        _resume_release_move(conn, cur, table, batch_size)
         return
 
+    cur.execute(_BULK_LOAD_SETTINGS_SQL)
+
     # Detach and rename existing partition
+    _forget_partitions()
     cur.execute(f"ALTER TABLE release DETACH PARTITION {table}")
     cur.execute(f"ALTER TABLE {table} RENAME TO {table}_old")
 
     # Create new partitioned table with the appropriate bounds
-    if ranges is None:
-        cur.execute(
-            f"CREATE TABLE {table} PARTITION OF release DEFAULT PARTITION BY RANGE (posted_at)"
-        )
-    else:
-        start, end = ranges
-        start_sql = _format_partition_bound(start)
-        end_sql = _format_partition_bound(end)
-        cur.execute(
-            f"CREATE TABLE {table} PARTITION OF release FOR VALUES FROM ({start_sql}) TO ({end_sql}) PARTITION BY RANGE (posted_at)"
-        )
+    bounds_sql = _category_bounds_sql(category)
+    cur.execute(
+        f"CREATE TABLE {table} PARTITION OF release {bounds_sql} PARTITION BY RANGE (posted_at)"
+    )
 
-    # Determine distinct years present in existing data
+    # Create one partition per year present in the existing data.  The years
+    # are iterated server-side so this is a single round trip however many
+    # there are.
+    years = _posted_at_years_sql(f"{table}_old")
     cur.execute(
-        f"SELECT DISTINCT EXTRACT(YEAR FROM posted_at) FROM {table}_old WHERE posted_at IS NOT NULL"
+        f"""
+        DO $$
+        DECLARE y int;
+        BEGIN
+            FOR y IN {years}
+            LOOP
+                EXECUTE format(
+                    'CREATE TABLE IF NOT EXISTS %I PARTITION OF %I '
+                    'FOR VALUES FROM (%L) TO (%L)',
+                    '{table}_' || y, '{table}',
+                    y || '-01-01', (y + 1) || '-01-01'
+                );
+            END LOOP;
+        END$$
+        """
     )
-    years = [int(r[0]) for r in cur.fetchall()]
-    for year in years:
-        cur.execute(
-            f"CREATE TABLE IF NOT EXISTS {table}_{year} PARTITION OF {table} FOR VALUES FROM ('{year}-01-01') TO ('{year + 1}-01-01')"
-        )
     cur.execute(
         f"CREATE TABLE IF NOT EXISTS {table}_default PARTITION OF {table} DEFAULT"
     )
+
     conn.commit()
     create_release_posted_at_index(conn)
+    # Move rows into new partitioned table.
+    _finish_release_move(conn, cur, table, batch_size)
 
-    # Move rows into new partitioned table
-    while True:
-        cur.execute(
-            f"""
-            WITH moved AS (
-                SELECT
-                    id, norm_title, category, category_id, language, tags,
-                    source_group, size_bytes, posted_at, segments, has_parts,
-                    part_count
-                FROM {table}_old ORDER BY id LIMIT {batch_size}
-            )
-            INSERT INTO {table} (
-                id, norm_title, category, category_id, language, tags,
-                source_group, size_bytes, posted_at, segments, has_parts,
-                part_count
-            )
-            SELECT
-                id, norm_title, category, category_id, language, tags,
-                source_group, size_bytes, posted_at, segments, has_parts,
-                part_count
-            FROM moved RETURNING id
-            """
-        )
-        ids = [row[0] for row in cur.fetchall()]
-        if not ids:
-            break
-        cur.execute(f"DELETE FROM {table}_old WHERE id = ANY($1)", (ids,))
-        conn.commit()
 
-    cur.execute(f"DROP TABLE {table}_old")
-    conn.commit()
+@lru_cache(maxsize=256)
+def _year_partition_sql(category: str, year: int) -> tuple[str, str]:
+    """Return the statements creating and indexing ``release_<category>_<year>``.
+
+    Only known categories are accepted and the bounds are rendered through
+    :func:`_format_partition_bound`, so nothing caller-supplied reaches the
+    statement unchecked.  The text is built once per category and year.
+    """
+
+    if category not in CATEGORY_RANGES:
+        raise ValueError(f"unknown category: {category}")
+    year = int(year)
+    parent = f"release_{category}"
+    table = f"{parent}_{year}"
+    start = _format_partition_bound(f"{year}-01-01")
+    end = _format_partition_bound(f"{year + 1}-01-01")
+    return (
+        f"CREATE TABLE IF NOT EXISTS {table} PARTITION OF {parent} FOR VALUES FROM ({start}) TO ({end})",
+        f"CREATE INDEX IF NOT EXISTS {table}_posted_at_idx ON {table} (posted_at)",
+    )
+
+
+# ``(connection, table)`` pairs of year partitions known to exist, so repeat
+# calls skip the catalog lookups.  Cleared whenever this module drops, renames
+# or detaches release tables.
+_KNOWN_PARTITIONS: set[tuple[object, str]] = set()
+
+
+def _connection_key(conn: Any) -> object:
+    """Return a key identifying the server session behind ``conn``.
+
+    psycopg exposes the backend PID, so a reconnect starts with an empty
+    cache; other drivers fall back to the connection object's identity.
+    """
+
+    pid = getattr(getattr(conn, "info", None), "backend_pid", None)
+    return pid if pid is not None else id(conn)
+
+
+def _forget_partitions() -> None:
+    """Invalidate the cache of known year partitions."""
+
+    _KNOWN_PARTITIONS.clear()
+
+
+# SQLSTATEs raised by :func:`_ensure_year_partition_sql` when the parent is
+# missing or not yet partitioned by ``posted_at``, or when the partition
+# already exists without its ``posted_at`` index.
+_UNDEFINED_TABLE = "42P01"
+_WRONG_OBJECT_TYPE = "42809"
+_MISSING_INDEX = "55000"
+
+
+@lru_cache(maxsize=256)
+def _ensure_year_partition_sql(category: str, year: int) -> str:
+    """Return a ``DO`` block checking the parent and creating the partition.
+
+    The parent's existence and partition key are verified server-side in the
+    same statement that creates the partition, raising ``undefined_table``
+    or ``wrong_object_type`` when the partition cannot be created.  A new
+    partition is empty and invisible to writers until the block commits, so
+    its index is built inline; an existing partition lacking the index
+    raises ``object_not_in_prerequisite_state`` instead so the caller can
+    build it concurrently.
+    """
+
+    create = ";\n".join(_year_partition_sql(category, year))
+    parent = f"release_{category}"
+    table = f"{parent}_{year}"
+    return f"""
+        DO $$
+        BEGIN
+            IF to_regclass('{parent}') IS NULL THEN
+                RAISE EXCEPTION 'parent table {parent} not found'
+                    USING ERRCODE = 'undefined_table';
+            END IF;
+            IF coalesce(pg_get_partkeydef('{parent}'::regclass), '')
+                    NOT LIKE '%posted_at%' THEN
+                RAISE EXCEPTION '{parent} is not partitioned by posted_at'
+                    USING ERRCODE = 'wrong_object_type';
+            END IF;
+            IF to_regclass('{table}') IS NULL THEN
+                {create};
+            ELSIF to_regclass('{table}_posted_at_idx') IS NULL THEN
+                RAISE EXCEPTION '{table} has no posted_at index'
+                    USING ERRCODE = 'object_not_in_prerequisite_state';
+            END IF;
+        END$$
+        """
 
 
 def ensure_release_year_partition(conn: Any, category: str, year: int) -> None:
@@ -272,58 +731,146 @@ def ensure_release_year_partition(conn: Any, category: str, year: int) -> None:
 
     table = f"release_{category}_{year}"
     parent = f"release_{category}"
-    cur = conn.cursor()
-    cur.execute("SELECT to_regclass($1)", (table,))
-    if cur.fetchone()[0] is not None:
+    key = (_connection_key(conn), table)
+    if key in _KNOWN_PARTITIONS:
         return
-    # Ensure the parent table exists and is partitioned by ``posted_at`` before
-    # attempting to create a child partition.  ``pg_partitioned_table`` only
-    # contains entries for partitioned tables, so we query it and verify the
-    # partition key definition references ``posted_at``.
-    cur.execute("SELECT to_regclass($1)", (parent,))
-    if cur.fetchone()[0] is None:
-        logger.warning(
-            "parent table %s not found; skipping creation of %s", parent, table
-        )
+    cur = conn.cursor()
+    # Check the parent and create the partition in a single round trip.
+    try:
+        cur.execute(_ensure_year_partition_sql(category, year))
+    except Exception as exc:
         conn.rollback()
+        sqlstate = getattr(exc, "sqlstate", None)
+        if sqlstate == _UNDEFINED_TABLE:
+            logger.warning(
+                "parent table %s not found; skipping creation of %s", parent, table
+            )
+            return
+        if sqlstate == _WRONG_OBJECT_TYPE:
+            logger.warning(
+                "%s is not partitioned by posted_at; migrating and skipping partition creation",
+                parent,
+            )
+            migrate_release_partitions_by_date(conn, category)
+            # Try again now that the parent has been migrated.
+            ensure_release_year_partition(conn, category, year)
+            return
+        if sqlstate == _MISSING_INDEX:
+            # The partition may already take inserts; build the index
+            # without blocking them.
+            _execute_autocommit(
+                conn,
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {table}_posted_at_idx ON {table} (posted_at)",
+            )
+            _KNOWN_PARTITIONS.add(key)
+            return
+        raise
+    conn.commit()
+    _KNOWN_PARTITIONS.add(key)
+
+
+def _execute_autocommit(conn: Any, sql: str) -> None:
+    """Run ``sql`` outside a transaction block, as ``CONCURRENTLY`` requires."""
+
+    previous = conn.autocommit
+    conn.autocommit = True
+    try:
+        conn.cursor().execute(sql)
+    finally:
+        conn.autocommit = previous
+
+
+# Serialises concurrent partition creation so ``IF NOT EXISTS`` cannot race
+# into duplicate catalog entries when several workers run the cron at once.
+_PARTITION_LOCK_SQL = (
+    "SELECT pg_advisory_xact_lock(hashtext('nzbidx_release_partitions'))"
+)
+
+
+def _ensure_partitions(
+    conn: Any, years: Iterable[int], categories: Iterable[str]
+) -> None:
+    """Create the ``years`` partitions of every ``release_<category>``.
+
+    Parents are inspected with a single catalog query, and the partitions and
+    their indexes are created in one transaction under the advisory lock,
+    whatever the number of years and categories.  Categories whose parent is
+    not yet partitioned by ``posted_at`` go through
+    :func:`ensure_release_year_partition`, which migrates them first.
+    """
+
+    conn_key = _connection_key(conn)
+    years = list(years)
+    pending = [
+        (category, year)
+        for category in categories
+        for year in years
+        if (conn_key, f"release_{category}_{year}") not in _KNOWN_PARTITIONS
+    ]
+    if not pending:
         return
+    cur = conn.cursor()
     cur.execute(
         """
-        SELECT pg_get_partkeydef(pt.partrelid)
-        FROM pg_partitioned_table pt
-        WHERE pt.partrelid = $1::regclass
+        SELECT c.relname, pg_get_partkeydef(c.oid)
+        FROM pg_class c
+        WHERE c.relname = ANY($1)
         """,
-        (parent,),
-    )
-    row = cur.fetchone()
-    if row is None or "posted_at" not in row[0]:
-        logger.warning(
-            "%s is not partitioned by posted_at; migrating and skipping partition creation",
-            parent,
-        )
-        conn.rollback()
-        migrate_release_partitions_by_date(conn, category)
-        # Try again now that the parent has been migrated.
-        ensure_release_year_partition(conn, category, year)
-        return
-    cur.execute(
-        f"CREATE TABLE IF NOT EXISTS {table} PARTITION OF {parent} FOR VALUES FROM ('{year}-01-01') TO ('{year + 1}-01-01')",
-    )
-    cur.execute(
-        f"CREATE INDEX IF NOT EXISTS {table}_posted_at_idx ON {table} (posted_at)",
+        (list(dict.fromkeys(f"release_{category}" for category, _ in pending)),),
     )
+    partkeys = dict(cur.fetchall())
+    statements: list[str] = [_PARTITION_LOCK_SQL]
+    created: list[str] = []
+    unmigrated: list[tuple[str, int]] = []
+    for category, year in pending:
+        parent = f"release_{category}"
+        table = f"{parent}_{year}"
+        if parent not in partkeys:
+            logger.warning(
+                "parent table %s not found; skipping creation of %s", parent, table
+            )
+            continue
+        if "posted_at" not in (partkeys[parent] or ""):
+            unmigrated.append((category, year))
+            continue
+        statements.extend(_year_partition_sql(category, year))
+        created.append(table)
+    if created:
+        # The lock is transaction scoped, so it covers every statement up to
+        # the commit below.
+        _execute_each(cur, statements)
     conn.commit()
+    _KNOWN_PARTITIONS.update((conn_key, table) for table in created)
+    for category, year in unmigrated:
+        ensure_release_year_partition(conn, category, year)
+
+
+def ensure_year_partitions(
+    conn: Any, year: int, categories: Iterable[str] = DATED_CATEGORIES
+) -> None:
+    """Create the ``year`` partition of every ``release_<category>`` at once."""
+
+    _ensure_partitions(conn, (year,), categories)
 
 
 def ensure_current_and_next_year_partitions(conn: Any) -> None:
-    """Pre-create ``release`` partitions for the current and next year."""
+    """Pre-create ``release`` partitions for the current and next year.
+
+    Both years are created in the same transaction, after a single probe.
+    """
 
     year = datetime.now().year
-    for category, bounds in CATEGORY_RANGES.items():
-        if bounds is None:
-            continue
-        ensure_release_year_partition(conn, category, year)
-        ensure_release_year_partition(conn, category, year + 1)
+    _ensure_partitions(conn, (year, year + 1), DATED_CATEGORIES)
+
+
+def _delete_posted_before(cur: Any, table: str, cutoff_date: date) -> int:
+    """Delete rows in ``table`` posted before ``cutoff_date``; return the count."""
+
+    cur.execute(
+        f"DELETE FROM {table} WHERE posted_at IS NOT NULL AND posted_at < $1",
+        (cutoff_date,),
+    )
+    return max(int(cur.rowcount or 0), 0)
 
 
 def drop_release_partitions_before(
@@ -344,10 +891,7 @@ def drop_release_partitions_before(
     deleted: dict[str, int] = {}
     cur = conn.cursor()
 
-    for category, bounds in CATEGORY_RANGES.items():
-        if bounds is None:
-            continue
-
+    for category in DATED_CATEGORIES:
         parent = f"release_{category}"
         cur.execute(
             """
@@ -381,34 +925,21 @@ def drop_release_partitions_before(
                 continue
             if upper_date <= cutoff_date:
                 cur.execute(f"DROP TABLE IF EXISTS {table}")
+                _forget_partitions()
                 dropped.append(table)
                 continue
             if lower_date < cutoff_date:
-                cur.execute(
-                    f"DELETE FROM {table} "
-                    "WHERE posted_at IS NOT NULL AND posted_at < $1",
-                    (cutoff_date,),
-                )
-                count = cur.rowcount or 0
-                if count < 0:
-                    count = 0
+                count = _delete_posted_before(cur, table, cutoff_date)
                 if count:
-                    deleted[table] = deleted.get(table, 0) + int(count)
+                    deleted[table] = deleted.get(table, 0) + count
 
         default_table = f"{parent}_default"
         cur.execute("SELECT to_regclass($1)", (default_table,))
         regclass = cur.fetchone()
         if not regclass or regclass[0] is None:
             continue
-        cur.execute(
-            f"DELETE FROM {default_table} "
-            "WHERE posted_at IS NOT NULL AND posted_at < $1",
-            (cutoff_date,),
-        )
-        count = cur.rowcount or 0
-        if count < 0:
-            count = 0
-        deleted[default_table] = deleted.get(default_table, 0) + int(count)
+        count = _delete_posted_before(cur, default_table, cutoff_date)
+        deleted[default_table] = deleted.get(default_table, 0) + count
 
     conn.commit()
     dropped.sort()
@@ -420,40 +951,61 @@ def drop_unused_release_partitions(
 ) -> None:
     """Drop empty ``release_<category>`` partitions not in ``retain``."""
 
+    if category not in CATEGORY_RANGES:
+        raise ValueError(f"unknown category: {category}")
     parent = f"release_{category}"
+    if retain is None:
+        env = os.getenv(f"RELEASE_{category.upper()}_PARTITIONS_RETAIN", "")
+        retain_set = {p.strip() for p in env.split(",") if p.strip()}
+    else:
+        retain_set = set(retain)
+    retain_set.add(f"{parent}_default")
+
     cur = conn.cursor()
+    # ``reltuples`` is the planner's row estimate (-1 if never analysed) and
+    # ``n_live_tup`` counts rows written since; only partitions both consider
+    # empty, and that span at most one block, are probed for rows.  The size
+    # cap keeps the probe from streaming the dead pages of a bloated dormant
+    # partition; vacuum truncates those before it becomes a candidate.
+    # Retained partitions are filtered out here.
     cur.execute(
         """
         SELECT c.relname
         FROM pg_inherits i
         JOIN pg_class c ON c.oid = i.inhrelid
         JOIN pg_class p ON p.oid = i.inhparent
+        LEFT JOIN pg_stat_user_tables s ON s.relid = c.oid
         WHERE p.relname = $1
+            AND c.reltuples <= 0
+            AND COALESCE(s.n_live_tup, 0) = 0
+            AND pg_relation_size(c.oid) <= current_setting('block_size')::int
+            AND c.relname <> ALL($2)
         """,
-        (parent,),
+        (parent, sorted(retain_set)),
     )
-    partitions = [row[0] for row in cur.fetchall()]
-
-    if retain is None:
-        env = os.getenv(f"RELEASE_{category.upper()}_PARTITIONS_RETAIN", "")
-        retain_set = {p.strip() for p in env.split(",") if p.strip()}
-    else:
-        retain_set = set(retain)
-    retain_set.add(f"{parent}_default")
+    candidates = [row[0] for row in cur.fetchall()]
 
-    for table in partitions:
-        if table in retain_set:
-            continue
-        cur.execute(f"SELECT 1 FROM {table} LIMIT 1")
-        if cur.fetchone() is None:
-            cur.execute(f"DROP TABLE {table}")
+    empty: list[str] = []
+    if candidates:
+        # Probe every candidate in one statement; it returns the non-empty ones.
+        cur.execute(
+            " UNION ALL ".join(
+                f"SELECT '{table}' WHERE EXISTS (SELECT 1 FROM {table})"
+                for table in candidates
+            )
+        )
+        used = {row[0] for row in cur.fetchall()}
+        empty = [table for table in candidates if table not in used]
+    if empty:
+        cur.execute(f"DROP TABLE {', '.join(empty)}")
+        _forget_partitions()
     conn.commit()
 
 
 # Backward-compatible aliases -------------------------------------------------
 
 
-def migrate_release_adult_partitions(conn: Any, batch_size: int = 1000) -> None:
+def migrate_release_adult_partitions(conn: Any, batch_size: int = 50_000) -> None:
     migrate_release_partitions_by_date(conn, "adult", batch_size=batch_size)
 
 
@@ -471,43 +1023,32 @@ def create_release_posted_at_index(conn: Any) -> None:
     """Ensure ``release_posted_at_idx`` exists on ``release`` and its partitions."""
 
     cur = conn.cursor()
-    # Ensure the ``release`` table exists before attempting to inspect partitions.
-    cur.execute("SELECT to_regclass('release')")
-    if cur.fetchone()[0] is None:
-        logger.info("release table not found; skipping posted_at index creation")
-        conn.rollback()
-        return
-
     try:
+        # Fetch the whole partition tree in one query instead of one lookup
+        # per table.  The walk starts from ``to_regclass`` so a missing
+        # ``release`` table yields no rows rather than a separate probe.
         cur.execute(
             """
-            SELECT inhrelid::regclass::text
-            FROM pg_inherits
-            WHERE inhparent = 'release'::regclass
+            WITH RECURSIVE tree(oid) AS (
+                SELECT oid FROM pg_class WHERE oid = to_regclass('release')
+                UNION ALL
+                SELECT i.inhrelid FROM pg_inherits i JOIN tree ON i.inhparent = tree.oid
+            )
+            SELECT DISTINCT oid::regclass::text FROM tree
             """
         )
-        tables = ["release"] + [row[0] for row in cur.fetchall()]
-        seen: set[str] = set()
-        while tables:
-            table = tables.pop()
-            if table in seen:
-                continue
-            seen.add(table)
+        tables = [row[0] for row in cur.fetchall()]
+        if not tables:
+            logger.info("release table not found; skipping posted_at index creation")
+            conn.rollback()
+            return
+        for table in tables:
             index = (
                 "release_posted_at_idx"
                 if table == "release"
                 else f"{table}_posted_at_idx"
             )
             cur.execute(f"CREATE INDEX IF NOT EXISTS {index} ON {table} (posted_at)")
-            cur.execute(
-                """
-                SELECT inhrelid::regclass::text
-                FROM pg_inherits
-                WHERE inhparent = $1::regclass
-                """,
-                (table,),
-            )
-            tables.extend(row[0] for row in cur.fetchall())
         conn.commit()
     except Exception as exc:
         conn.rollback()
@@ -2,13 +2,19 @@
 
 from __future__ import annotations
 
+import itertools
 import logging
 import math
+import threading
 import time
 from collections import defaultdict
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
 from threading import Event
+from typing import Callable
 
 from nzbidx_api.json_utils import orjson as json
+from nzbidx_api.metrics_log import inc as inc_metric
 
 from .config import (
     INGEST_BATCH_MIN,
@@ -27,6 +33,7 @@ from .parsers import (
     detect_language,
     extract_segment_number,
     extract_file_extension,
+    parse_header_date,
 )
 from .segment_schema import validate_segment_schema
 from .main import (
@@ -38,8 +45,6 @@ from .main import (
     prune_non_curated_groups,
 )
 from .sql import sql_placeholder
-from email.utils import parsedate_to_datetime
-from datetime import timezone
 
 try:  # pragma: no cover - optional dependency
     import psycopg
@@ -56,8 +61,52 @@ _group_failures: dict[str, int] = {}
 # The value is a monotonic timestamp after which the group should be retried.
 _group_probes: dict[str, float] = {}
 
+# Maximum number of titles looked up per ``SELECT ... IN`` when merging
+# segments, keeping the statement within SQLite's parameter limit.
+SEGMENT_LOOKUP_CHUNK = 500
+
+# Merge new segments into ``release.segments`` on the server so existing
+# arrays never travel to Python. Segments are deduplicated by message-id,
+# keeping stored entries ahead of new ones, and the row totals are derived
+# from the merged array. Rows whose headers were all seen before are left
+# untouched.
+_MERGE_SEGMENTS_SQL = """
+WITH batch AS (
+    SELECT b.norm_title, b.segments
+    FROM jsonb_to_recordset(%s::jsonb) AS b(norm_title text, segments jsonb)
+),
+merged AS (
+    SELECT r.id, m.segments, m.part_count, m.size_bytes
+    FROM release AS r
+    JOIN batch AS b ON b.norm_title = r.norm_title
+    CROSS JOIN LATERAL (
+        SELECT coalesce(jsonb_agg(u.seg ORDER BY u.ord), '[]'::jsonb) AS segments,
+               count(*) AS part_count,
+               coalesce(sum((u.seg->>'size')::bigint), 0) AS size_bytes
+        FROM (
+            SELECT DISTINCT ON (e.seg->>'message_id') e.seg, e.ord
+            FROM jsonb_array_elements(
+                coalesce(r.segments, '[]'::jsonb) || b.segments
+            ) WITH ORDINALITY AS e(seg, ord)
+            ORDER BY e.seg->>'message_id', e.ord
+        ) AS u
+    ) AS m
+)
+UPDATE release AS r
+SET segments = m.segments,
+    part_count = m.part_count,
+    size_bytes = m.size_bytes,
+    has_parts = m.part_count > 0
+FROM merged AS m
+WHERE r.id = m.id
+  AND m.part_count <> coalesce(jsonb_array_length(r.segments), 0)
+RETURNING r.norm_title, r.category_id, r.size_bytes, r.part_count
+"""
+
 # Counter used to throttle how often batch metrics are logged at INFO level.
-_log_counter = 0
+# ``next()`` on ``itertools.count`` is a single C call, so concurrent callers
+# never observe a torn read-modify-write.
+_log_counter = itertools.count(1)
 
 # Monotonic timestamp of the last successful ingest iteration.
 last_run: float = 0.0
@@ -68,16 +117,18 @@ last_run_wall: float = 0.0
 class _AggregateMetrics:
     """Helper to accumulate metrics across groups during a poll cycle."""
 
+    __slots__ = ("_processed", "_remaining", "_duration_s")
+
     def __init__(self) -> None:
         self._processed = 0
         self._remaining = 0
         self._duration_s = 0.0
 
-    def add(self, metrics: dict[str, int | float]) -> None:
-        """Add per-group metrics to the aggregate."""
-        self._processed += int(metrics.get("processed", 0))
-        self._remaining += int(metrics.get("remaining", 0))
-        self._duration_s += float(metrics.get("duration_ms", 0)) / 1000
+    def add(self, processed: int, remaining: int, duration_s: float) -> None:
+        """Add one group's batch totals to the aggregate."""
+        self._processed += processed
+        self._remaining += remaining
+        self._duration_s += duration_s
 
     def summary(self) -> dict[str, int]:
         """Return aggregate metrics including global ETA."""
@@ -100,23 +151,183 @@ def _clean_text(s: str) -> str:
     and decoding back to ``str`` drops any such characters.  NUL bytes are
     stripped separately since they can cause issues with some databases and
     tools.
+
+    Pure ASCII text cannot hold surrogates, so when it also has no NUL byte
+    it is returned unchanged without building any intermediate copies.
     """
 
+    if s.isascii() and "\x00" not in s:
+        return s
     return s.replace("\x00", "").encode("utf-8", errors="ignore").decode("utf-8")
 
 
+@lru_cache(maxsize=8192)
+def _posted_fields(raw: str) -> tuple[str | None, str]:
+    """Return ``(posted_at, day_bucket)`` for a raw ``Date`` header.
+
+    Articles posted together share the same header, so the parsed and
+    formatted values are cached on the raw string.
+    """
+
+    try:
+        dt = parse_header_date(raw)
+    except Exception:
+        return None, ""
+    return dt.isoformat(), dt.strftime("%Y-%m-%d")
+
+
+# Cursor updates are buffered and written with one ``set_cursors`` call once
+# this many groups have advanced (or the poll cycle ends).
+CURSOR_FLUSH_SIZE = 1000
+
+
+def _high_water_mark(client: NNTPClient, group: str) -> int:
+    if hasattr(client, "group"):
+        try:
+            _resp, _count, _low, high_s, _name = client.group(group)
+            return int(high_s)
+        except Exception:
+            return 0
+    try:
+        return int(client.high_water_mark(group))
+    except Exception:
+        return 0
+
+
+def _batch_end(start: int, remaining: int) -> int:
+    batch = min(remaining, INGEST_BATCH_MAX)
+    batch = max(batch, min(remaining, INGEST_BATCH_MIN))
+    return start + batch - 1
+
+
+class _HeaderPrefetcher:
+    """Fetch upcoming groups' headers on additional NNTP connections.
+
+    Each worker thread owns its own client so sockets are never shared. Only
+    the NNTP round trips overlap; groups are still written one at a time.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], NNTPClient],
+        connections: int,
+        groups: list[str],
+    ) -> None:
+        self._factory = factory
+        self._groups = groups
+        self._window = connections * 2
+        self._next = 0
+        self._pending: dict[str, tuple[int, Future]] = {}
+        self._local = threading.local()
+        self._clients: list[NNTPClient] = []
+        self._clients_lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=connections, thread_name_prefix="nntp-prefetch"
+        )
+
+    def _client(self) -> NNTPClient:
+        client = getattr(self._local, "client", None)
+        if client is None:
+            client = self._factory()
+            self._local.client = client
+            with self._clients_lock:
+                self._clients.append(client)
+        return client
+
+    def _fetch(self, group: str, last: int) -> tuple[int, list[dict[str, object]]]:
+        client = self._client()
+        high = _high_water_mark(client, group)
+        remaining = max(high - last, 0)
+        if remaining <= 0:
+            return high, []
+        start = last + 1
+        return high, client.xover(group, start, _batch_end(start, remaining))
+
+    def take(
+        self, group: str, last: int
+    ) -> Future[tuple[int, list[dict[str, object]]]] | None:
+        """Return the fetch for ``group`` and queue the groups after it.
+
+        ``None`` is returned when nothing was fetched for ``group`` from
+        cursor ``last`` so the caller falls back to its own client.
+        """
+        while self._next < len(self._groups) and len(self._pending) < self._window:
+            upcoming = self._groups[self._next]
+            self._next += 1
+            if upcoming == group or upcoming in self._pending:
+                continue
+            upcoming_last = cursors.get_cursor(upcoming) or 0
+            self._pending[upcoming] = (
+                upcoming_last,
+                self._executor.submit(self._fetch, upcoming, upcoming_last),
+            )
+        pending = self._pending.pop(group, None)
+        if pending is None:
+            return None
+        fetched_last, future = pending
+        if fetched_last != last:
+            future.cancel()
+            return None
+        return future
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        for client in self._clients:
+            try:
+                client.quit()
+            except Exception:  # pragma: no cover - best effort cleanup
+                logger.debug("header_prefetch_quit_failed", exc_info=True)
+
+
 def _process_groups(
     client: NNTPClient,
     db: object,
     groups: list[str],
     ignored: set[str],
     curated_mode: bool,
+) -> float:
+    pending_cursors: dict[str, int] = {}
+    prefetcher = None
+    if config.NNTP_MAX_CONN > 1 and len(groups) > 1:
+        # The main client counts towards the connection limit.
+        prefetcher = _HeaderPrefetcher(
+            lambda: NNTPClient(config.NNTP_SETTINGS),
+            config.NNTP_MAX_CONN - 1,
+            groups,
+        )
+    try:
+        return _ingest_groups(
+            client, db, groups, ignored, curated_mode, pending_cursors, prefetcher
+        )
+    finally:
+        if prefetcher is not None:
+            prefetcher.close()
+        if pending_cursors:
+            cursors.set_cursors(pending_cursors)
+
+
+def _ingest_groups(
+    client: NNTPClient,
+    db: object,
+    groups: list[str],
+    ignored: set[str],
+    curated_mode: bool,
+    pending_cursors: dict[str, int],
+    prefetcher: _HeaderPrefetcher | None = None,
 ) -> float:
     aggregate = _AggregateMetrics()
     db_errors: tuple[type[BaseException], ...] = ()
     if psycopg:
         db_errors = (psycopg.DataError,)
 
+    # Statement text only depends on the connection, so it is built once per
+    # cycle instead of for every group batch.
+    is_sqlite = db.__class__.__module__.startswith("sqlite3")
+    placeholder = sql_placeholder(db) if db is not None else "%s"
+    lookup_sql: dict[int, str] = {}
+    delete_sql = f"DELETE FROM release WHERE norm_title = {placeholder} AND category_id = {placeholder}"
+    update_sql = f"UPDATE release SET segments = {placeholder}, has_parts = {placeholder}, part_count = {placeholder}, size_bytes = {placeholder} WHERE norm_title = {placeholder}"
+
     for ig in ignored:
         prune_group(db, ig)
 
@@ -124,31 +335,32 @@ def _process_groups(
         for attempt in range(2):
             last = cursors.get_cursor(group) or 0
             start = last + 1
-            high = 0
-            if hasattr(client, "group"):
-                try:
-                    _resp, _count, _low, high_s, _name = client.group(group)
-                    high = int(high_s)
-                except Exception:
-                    high = 0
-            else:
+            fetched = None
+            if prefetcher is not None and attempt == 0:
+                fetched = prefetcher.take(group, last)
+            if fetched is not None:
                 try:
-                    high = int(client.high_water_mark(group))
+                    high, prefetched = fetched.result()
                 except Exception:
-                    high = 0
+                    # Retry on the main client so failures are handled below.
+                    fetched = None
+            if fetched is None:
+                high = _high_water_mark(client, group)
             remaining = max(high - last, 0)
             headers: list[dict[str, object]] = []
             if remaining > 0:
-                batch = min(remaining, INGEST_BATCH_MAX)
-                batch = max(batch, min(remaining, INGEST_BATCH_MIN))
-                end = start + batch - 1
+                end = _batch_end(start, remaining)
                 try:
-                    headers = client.xover(group, start, end)
+                    if fetched is not None:
+                        headers = prefetched
+                    else:
+                        headers = client.xover(group, start, end)
                     _group_failures[group] = 0
                     _group_probes.pop(group, None)
                 except Exception:
                     failures = _group_failures.get(group, 0) + 1
                     _group_failures[group] = failures
+                    inc_metric("ingest_xover_failures_total", labels={"group": group})
                     logger.exception(
                         "ingest_xover_error",
                         extra={
@@ -207,205 +419,277 @@ def _process_groups(
                 break
         if not headers:
             continue
-        metrics = {"processed": 0, "inserted": 0}
+        # Every fetched header counts as processed, so the batch totals are
+        # set once rather than updated per header.
+        metrics = {"processed": len(headers), "inserted": 0}
         batch_start = time.monotonic()
-        current = last
-        releases: dict[
-            str,
-            tuple[
-                str,
-                str | None,
-                str | None,
-                list[str] | None,
-                str | None,
-                int | None,
-                str | None,
-            ],
-        ] = {}
+        current = start + len(headers) - 1
+        # Release fields are kept in parallel lists indexed through
+        # ``key_index`` so duplicate headers update a slot in place instead of
+        # rebuilding a tuple per header.
+        key_index: dict[str, int] = {}
+        cats: list[str] = []
+        langs: list[str] = []
+        tags_list: list[list[str]] = []
+        # Slots whose tags were extended by duplicate headers; they are
+        # deduplicated and sorted once before the insert.
+        merged_tags: set[int] = set()
+        groups_list: list[str] = []
+        sizes: list[int] = []
+        posted_ats: list[str | None] = []
         parts: defaultdict[str, list[tuple[int, str, str, int]]] = defaultdict(list)
-        for idx, header in enumerate(headers, start=start):
-            metrics["processed"] += 1
+        group_clean = _clean_text(str(group))
+        # Extension allow-lists resolved per category for this batch.
+        allowed_by_category: dict[str, frozenset[str] | None] = {}
+        # Look up every missing size for the batch at once.  ``body_size`` is
+        # only used when the server answered nothing for the range; articles
+        # a successful range lookup left out have no size and are skipped.
+        known_sizes: dict[str, int] = {}
+        if hasattr(client, "body_sizes") and any(
+            not (h.get("bytes") or h.get(":bytes")) and h.get("message-id")
+            for h in headers
+        ):
+            known_sizes = client.body_sizes(group, start, end)
+        for header in headers:
             size = int(header.get("bytes") or header.get(":bytes") or 0)
-            current = idx
             message_id = _clean_text(str(header.get("message-id") or "")).strip()
             if size <= 0 and message_id:
-                size = client.body_size(message_id)
+                if known_sizes:
+                    size = known_sizes.get(message_id.strip("<>"), 0)
+                else:
+                    size = client.body_size(message_id)
             if size <= 0:
                 continue
             subject = _clean_text(str(header.get("subject", "")))
             norm_title, tags = normalize_subject(subject, with_tags=True)
             norm_title = _clean_text(norm_title)
             posted = header.get("date")
-            day_bucket = ""
-            posted_at = None
-            if posted:
-                try:
-                    dt = parsedate_to_datetime(str(posted)).astimezone(timezone.utc)
-                    posted_at = _clean_text(dt.isoformat())
-                    day_bucket = dt.strftime("%Y-%m-%d")
-                except Exception:
-                    day_bucket = ""
-            dedupe_key = _clean_text(
-                f"{norm_title}:{day_bucket}" if day_bucket else norm_title
+            posted_at, day_bucket = (
+                _posted_fields(str(posted)) if posted else (None, "")
             )
-            language = _clean_text(detect_language(subject) or "und")
-            category = _clean_text(
-                _infer_category(subject, str(group)) or CATEGORY_MAP["other"]
-            )
-            group_clean = _clean_text(str(group))
+            # Only the subject and message-id come from the server; the fields
+            # derived from them or from fixed tables need no further cleaning.
+            dedupe_key = f"{norm_title}:{day_bucket}" if day_bucket else norm_title
+            language = detect_language(subject) or "und"
+            category = _infer_category(subject, str(group)) or CATEGORY_MAP["other"]
             ext = extract_file_extension(subject)
-            allowed: set[str] | None = None
-            try:
-                cat_int = int(category)
-                if 2000 <= cat_int < 3000:
-                    allowed = config.ALLOWED_MOVIE_EXTENSIONS
-                elif 5000 <= cat_int < 6000:
-                    allowed = config.ALLOWED_TV_EXTENSIONS
-                elif 6000 <= cat_int < 7000:
-                    allowed = config.ALLOWED_ADULT_EXTENSIONS
-            except Exception:
-                allowed = None
+            if category in allowed_by_category:
+                allowed = allowed_by_category[category]
+            else:
+                allowed = config.allowed_extensions_for_category(category)
+                allowed_by_category[category] = allowed
             if allowed is not None and (not ext or ext not in allowed):
                 continue
-            tags = [_clean_text(tag) for tag in (tags or [])]
-            existing = releases.get(dedupe_key)
-            if existing:
-                _, ex_cat, ex_lang, ex_tags, ex_group, ex_size, ex_posted = existing
-                combined_size = (ex_size or 0) + size
-                combined_tags = sorted(set(ex_tags or []).union(tags))
-                combined_posted = ex_posted
-                if posted_at and (not ex_posted or posted_at < ex_posted):
-                    combined_posted = posted_at
-                releases[dedupe_key] = (
-                    dedupe_key,
-                    ex_cat,
-                    ex_lang,
-                    combined_tags,
-                    ex_group,
-                    combined_size,
-                    combined_posted,
-                )
+            tags = list(tags or [])
+            i = key_index.get(dedupe_key)
+            if i is not None:
+                sizes[i] += size
+                tags_list[i].extend(tags)
+                merged_tags.add(i)
+                if posted_at and (not posted_ats[i] or posted_at < posted_ats[i]):
+                    posted_ats[i] = posted_at
             else:
-                releases[dedupe_key] = (
-                    dedupe_key,
-                    category,
-                    language,
-                    tags,
-                    group_clean,
-                    size,
-                    posted_at,
-                )
+                key_index[dedupe_key] = len(cats)
+                cats.append(category)
+                langs.append(language)
+                tags_list.append(tags)
+                groups_list.append(group_clean)
+                sizes.append(size)
+                posted_ats.append(posted_at)
             if message_id:
                 seg_num = extract_segment_number(subject)
-                clean_id = _clean_text(message_id.strip("<>"))
-                parts[dedupe_key].append((seg_num, clean_id, group_clean, size))
+                parts[dedupe_key].append(
+                    (seg_num, message_id.strip("<>"), group_clean, size)
+                )
         db_latency = 0.0
         inserted: set[str] = set()
-        if releases:
+        for i in merged_tags:
+            tags_list[i] = sorted(set(tags_list[i]))
+        if key_index:
             db_start = time.monotonic()
-            result = insert_release(db, releases=releases.values())
+            result = insert_release(
+                db,
+                releases=zip(
+                    key_index, cats, langs, tags_list, groups_list, sizes, posted_ats
+                ),
+            )
             db_latency = time.monotonic() - db_start
             if isinstance(result, set):
                 inserted = result
             elif result:
-                inserted = {r[0] for r in releases.values()}
+                inserted = set(key_index)
             metrics["inserted"] = len(inserted)
 
         changed: set[str] = set()
         part_counts: dict[str, int] = {}
         has_parts_flags: dict[str, bool] = {}
         if db is not None:
-            placeholder = sql_placeholder(db)
 
-            def _update_segments(cur: object) -> None:
-                for title, segs in parts.items():
-                    if not segs:
-                        continue
-                    cat = releases.get(title)
-                    group_name = cat[4] if cat else None
+            def _log_data_error(titles: list[str]) -> None:
+                for title in titles:
+                    i = key_index.get(title)
+                    logger.warning(
+                        "segment_update_data_error",
+                        extra={
+                            "norm_title": title,
+                            "group": groups_list[i] if i is not None else None,
+                        },
+                    )
+
+            def _fetch_segments(
+                cur: object, titles: list[str]
+            ) -> tuple[dict[str, object], set[str]]:
+                existing: dict[str, object] = {}
+                failed: set[str] = set()
+                for start in range(0, len(titles), SEGMENT_LOOKUP_CHUNK):
+                    chunk = titles[start : start + SEGMENT_LOOKUP_CHUNK]
+                    sql = lookup_sql.get(len(chunk))
+                    if sql is None:
+                        marks = ", ".join([placeholder] * len(chunk))
+                        sql = f"SELECT norm_title, segments FROM release WHERE norm_title IN ({marks})"
+                        lookup_sql[len(chunk)] = sql
                     try:
-                        cur.execute(
-                            f"SELECT segments FROM release WHERE norm_title = {placeholder}",
-                            (title,),
-                        )
-                        row = cur.fetchone()
+                        cur.execute(sql, chunk)
+                        rows = cur.fetchall()
                     except db_errors:  # type: ignore[misc]
-                        logger.warning(
-                            "segment_update_data_error",
-                            extra={"norm_title": title, "group": group_name},
-                        )
+                        _log_data_error(chunk)
                         db.rollback()
+                        failed.update(chunk)
                         continue
                     except Exception:
-                        row = None
+                        rows = []
+                    for title, segments in rows or []:
+                        existing.setdefault(title, segments)
+                return existing, failed
+
+            def _new_segments(
+                segs: list[tuple[int, str, str, int]],
+            ) -> list[dict[str, int | str]]:
+                # Deduplicate newly fetched segments by message-id before merging.
+                deduped: list[dict[str, int | str]] = []
+                seen_ids: set[str] = set()
+                # Message-ids and groups were cleaned when the parts were built.
+                for n, m, g, s in segs:
+                    if m in seen_ids:
+                        continue
+                    seen_ids.add(m)
+                    deduped.append(
+                        {
+                            "number": n,
+                            "message_id": m,
+                            "group": g,
+                            "size": s,
+                        },
+                    )
+                return deduped
+
+            def _delete_undersized(cur: object, deletes: list[tuple[str, int]]) -> None:
+                if not deletes:
+                    return
+                try:
+                    cur.executemany(delete_sql, deletes)
+                except db_errors:  # type: ignore[misc]
+                    _log_data_error([title for title, _ in deletes])
+                    db.rollback()
+                else:
+                    for title, _ in deletes:
+                        inserted.discard(title)
+
+            def _merge_segments_on_server(cur: object, titles: list[str]) -> None:
+                batch = []
+                for title in titles:
+                    deduped = _new_segments(parts[title])
+                    validate_segment_schema(deduped)
+                    batch.append({"norm_title": title, "segments": deduped})
+                try:
+                    cur.execute(_MERGE_SEGMENTS_SQL, (json.dumps(batch).decode(),))
+                    rows = cur.fetchall()
+                except db_errors:  # type: ignore[misc]
+                    _log_data_error(titles)
+                    db.rollback()
+                    return
+                deletes: list[tuple[str, int]] = []
+                for title, category_id, total_size, part_count in rows:
+                    part_counts[title] = part_count
+                    if total_size < min_size_for_release(title, str(category_id)):
+                        deletes.append((title, category_id))
+                        continue
+                    has_parts_flags[title] = part_count > 0
+                    changed.add(title)
+                _delete_undersized(cur, deletes)
+
+            def _update_segments(cur: object) -> None:
+                titles = [title for title, segs in parts.items() if segs]
+                if not titles:
+                    return
+                if not is_sqlite:
+                    _merge_segments_on_server(cur, titles)
+                    return
+                # One lookup per chunk of titles and one batched write for the
+                # updates and deletes instead of two statements per title.
+                existing_rows, failed = _fetch_segments(cur, titles)
+                updates: list[tuple[str, bool, int, int, str]] = []
+                deletes: list[tuple[str, int]] = []
+                for title in titles:
+                    if title in failed:
+                        continue
+                    segs = parts[title]
                     existing_segments = []
-                    if row:
+                    raw = existing_rows.get(title)
+                    if raw is not None:
                         try:
-                            existing_segments = json.loads(row[0] or "[]")
+                            existing_segments = json.loads(raw or "[]")
                         except Exception:
                             existing_segments = []
+                    # Older rows may hold escaped surrogates; clean ASCII
+                    # strings come back from ``_clean_text`` untouched.
                     for seg in existing_segments:
                         seg["message_id"] = _clean_text(str(seg.get("message_id", "")))
                         seg["group"] = _clean_text(str(seg.get("group", "")))
                     validate_segment_schema(existing_segments)
 
-                    # Deduplicate newly fetched segments by message-id before merging.
-                    deduped: list[dict[str, int | str]] = []
-                    seen_ids: set[str] = set()
-                    for n, m, g, s in segs:
-                        clean_m = _clean_text(m)
-                        clean_g = _clean_text(g)
-                        if clean_m in seen_ids:
-                            continue
-                        seen_ids.add(clean_m)
-                        deduped.append(
-                            {
-                                "number": n,
-                                "message_id": clean_m,
-                                "group": clean_g,
-                                "size": s,
-                            },
-                        )
+                    deduped = _new_segments(segs)
+                    validate_segment_schema(deduped)
 
                     existing_map = {seg["message_id"]: seg for seg in existing_segments}
+                    known = len(existing_map)
                     for seg in deduped:
                         message_id = seg["message_id"]
                         existing_map.setdefault(message_id, seg)
+                    if existing_segments and len(existing_map) == known:
+                        # Re-scanned headers only; the stored row is unchanged.
+                        continue
                     combined_segments = list(existing_map.values())
-                    validate_segment_schema(combined_segments)
                     total_size = sum(seg["size"] for seg in combined_segments)
                     part_counts[title] = len(combined_segments)
                     has_parts = bool(combined_segments)
-                    cat = releases.get(title)
-                    category_id = str(cat[1]) if cat else CATEGORY_MAP["other"]
+                    i = key_index.get(title)
+                    category_id = cats[i] if i is not None else CATEGORY_MAP["other"]
                     min_bytes = min_size_for_release(title, category_id)
-                    try:
-                        if total_size < min_bytes:
-                            cur.execute(
-                                f"DELETE FROM release WHERE norm_title = {placeholder} AND category_id = {placeholder}",
-                                (title, int(category_id)),
-                            )
-                            inserted.discard(title)
-                            continue
-                        cur.execute(
-                            f"UPDATE release SET segments = {placeholder}, has_parts = {placeholder}, part_count = {placeholder}, size_bytes = {placeholder} WHERE norm_title = {placeholder}",
-                            (
-                                json.dumps(combined_segments).decode(),
-                                has_parts,
-                                part_counts[title],
-                                total_size,
-                                title,
-                            ),
+                    if total_size < min_bytes:
+                        deletes.append((title, int(category_id)))
+                        continue
+                    updates.append(
+                        (
+                            json.dumps(combined_segments).decode(),
+                            has_parts,
+                            part_counts[title],
+                            total_size,
+                            title,
                         )
+                    )
+
+                _delete_undersized(cur, deletes)
+                if updates:
+                    try:
+                        cur.executemany(update_sql, updates)
                     except db_errors:  # type: ignore[misc]
-                        logger.warning(
-                            "segment_update_data_error",
-                            extra={"norm_title": title, "group": group_name},
-                        )
+                        _log_data_error([row[4] for row in updates])
                         db.rollback()
-                        continue
-                    has_parts_flags[title] = has_parts
-                    changed.add(title)
+                        return
+                    for _, has_parts, _, _, title in updates:
+                        has_parts_flags[title] = has_parts
+                        changed.add(title)
 
             try:
                 with db.cursor() as cur:
@@ -423,7 +707,10 @@ def _process_groups(
                 raise
 
         changed |= inserted
-        cursors.set_cursor(group, current)
+        pending_cursors[group] = current
+        if len(pending_cursors) >= CURSOR_FLUSH_SIZE:
+            cursors.set_cursors(pending_cursors)
+            pending_cursors.clear()
         metrics["deduplicated"] = metrics["processed"] - metrics["inserted"]
         duration_s = time.monotonic() - batch_start
         metrics["duration_ms"] = int(duration_s * 1000)
@@ -448,11 +735,10 @@ def _process_groups(
             rate = metrics["processed"] / duration_s
             metrics["eta_seconds"] = int(remaining / rate)
         metrics["group"] = group
-        global _log_counter
-        _log_counter += 1
+        batch_number = next(_log_counter)
         log_fn = logger.debug
         if metrics["inserted"] > 0 or (
-            config.INGEST_LOG_EVERY > 0 and _log_counter % config.INGEST_LOG_EVERY == 0
+            config.INGEST_LOG_EVERY > 0 and batch_number % config.INGEST_LOG_EVERY == 0
         ):
             log_fn = logger.info
         processed = metrics["processed"]
@@ -465,8 +751,12 @@ def _process_groups(
             f"{percent_complete}% complete, ETA {eta_seconds}s for {group}",
             extra=metrics,
         )
-        aggregate.add(metrics)
+        aggregate.add(processed, remaining, duration_s)
         if metrics["inserted"] == 0 and not curated_mode:
+            # Write this cursor now; a later batched upsert would clear the flag.
+            # A flush above may already have taken it out of the buffer.
+            pending_cursors.pop(group, None)
+            cursors.set_cursor(group, current)
             cursors.mark_irrelevant(group)
         sleep_ms = 0
         if INGEST_SLEEP_MS > 0 and avg_db_ms > INGEST_DB_LATENCY_MS:
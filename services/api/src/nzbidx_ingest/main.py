@@ -202,46 +202,48 @@ ADULT_KEYWORDS_RE = re.compile("|".join(map(re.escape, ADULT_KEYWORDS)))
 # Default set of file extensions that should be retained without any
 # additional configuration. Environment variables can extend this allow-list
 # via ``FILE_EXTENSIONS_*`` entries.
-DEFAULT_ALLOWED_EXTENSIONS: set[str] = {
-    # Archives and metadata
-    "rar",
-    "par2",
-    "zip",
-    "7z",
-    "nfo",
-    "sfv",
-    # Video
-    "mkv",
-    "mp4",
-    "mov",
-    "m4v",
-    "mpg",
-    "mpeg",
-    "avi",
-    "flv",
-    "webm",
-    "wmv",
-    "vob",
-    "evo",
-    "iso",
-    "m2ts",
-    "ts",
-    # Audio
-    "mp3",
-    "flac",
-    "aac",
-    "m4a",
-    "wav",
-    "ogg",
-    "wma",
-    # Books and comics
-    "epub",
-    "mobi",
-    "pdf",
-    "azw3",
-    "cbz",
-    "cbr",
-}
+DEFAULT_ALLOWED_EXTENSIONS: frozenset[str] = frozenset(
+    {
+        # Archives and metadata
+        "rar",
+        "par2",
+        "zip",
+        "7z",
+        "nfo",
+        "sfv",
+        # Video
+        "mkv",
+        "mp4",
+        "mov",
+        "m4v",
+        "mpg",
+        "mpeg",
+        "avi",
+        "flv",
+        "webm",
+        "wmv",
+        "vob",
+        "evo",
+        "iso",
+        "m2ts",
+        "ts",
+        # Audio
+        "mp3",
+        "flac",
+        "aac",
+        "m4a",
+        "wav",
+        "ogg",
+        "wma",
+        # Books and comics
+        "epub",
+        "mobi",
+        "pdf",
+        "azw3",
+        "cbz",
+        "cbr",
+    }
+)
 
 
 def _allowed_extensions() -> set[str]:
@@ -517,6 +519,106 @@ def connect_db() -> Any:
     return conn
 
 
+# PostgreSQL variant of ``insert_release`` as a single statement over a batch
+# exposed as ``batch``. The first row per (norm_title, category_id) is
+# inserted unless the pair already exists, while existing pairs only pick up
+# the latest ``posted_at`` from the batch. Only rows actually written are
+# returned.
+_INSERT_RELEASES_TAIL = """latest AS (
+    SELECT norm_title, category_id,
+           (array_agg(posted_at ORDER BY ord DESC)
+                FILTER (WHERE posted_at IS NOT NULL))[1] AS posted_at
+    FROM batch
+    GROUP BY norm_title, category_id
+),
+keyed AS (
+    SELECT DISTINCT ON (b.norm_title, b.category_id)
+           b.norm_title, b.category, b.category_id, b.language,
+           b.tags, b.source_group, b.size_bytes, l.posted_at
+    FROM batch AS b
+    JOIN latest AS l USING (norm_title, category_id)
+    ORDER BY b.norm_title, b.category_id, b.ord
+),
+updated AS (
+    UPDATE release AS r
+    SET posted_at = k.posted_at
+    FROM keyed AS k
+    WHERE r.norm_title = k.norm_title
+      AND r.category_id = k.category_id
+      AND k.posted_at IS NOT NULL
+),
+inserted AS (
+    INSERT INTO release (norm_title, category, category_id, language, tags, source_group, size_bytes, posted_at)
+    SELECT k.norm_title, k.category, k.category_id, k.language,
+           k.tags, k.source_group, k.size_bytes, k.posted_at
+    FROM keyed AS k
+    WHERE NOT EXISTS (
+        SELECT 1 FROM release AS r
+        WHERE r.norm_title = k.norm_title AND r.category_id = k.category_id
+    )
+    ON CONFLICT (norm_title, category_id, posted_at) DO NOTHING
+    RETURNING norm_title
+)
+SELECT norm_title FROM inserted
+"""
+
+# Small batches travel as one array per column in the statement itself.
+_INSERT_RELEASES_SQL = (
+    """
+WITH batch AS (
+    SELECT *
+    FROM unnest(
+        %s::text[], %s::text[], %s::int[], %s::text[],
+        %s::text[], %s::text[], %s::bigint[], %s::timestamptz[]
+    ) WITH ORDINALITY AS b(
+        norm_title, category, category_id, language,
+        tags, source_group, size_bytes, posted_at, ord
+    )
+),"""
+    + _INSERT_RELEASES_TAIL
+)
+
+# Large batches are loaded with binary ``COPY`` into a session temp table
+# first, skipping per-value text encoding and parameter parsing.  The default
+# threshold is half the largest ingest batch (``INGEST_BATCH_MAX``, else
+# ``INGEST_BATCH``), so batches where most headers are distinct releases take
+# this path.
+_INGEST_BATCH_MAX = int(
+    os.getenv("INGEST_BATCH_MAX") or os.getenv("INGEST_BATCH") or "1000"
+)
+RELEASE_COPY_MIN_ROWS = int(
+    os.getenv("RELEASE_COPY_MIN_ROWS") or max(1, _INGEST_BATCH_MAX // 2)
+)
+_RELEASE_STAGE_SQL = (
+    "CREATE TEMP TABLE IF NOT EXISTS release_stage ("
+    "norm_title text, category text, category_id int, language text, "
+    "tags text, source_group text, size_bytes bigint, posted_at timestamptz, "
+    "ord bigint) ON COMMIT DELETE ROWS"
+)
+_RELEASE_STAGE_COPY_SQL = (
+    "COPY release_stage (norm_title, category, category_id, language, tags, "
+    "source_group, size_bytes, posted_at, ord) FROM STDIN (FORMAT BINARY)"
+)
+_RELEASE_STAGE_TYPES = [
+    "text",
+    "text",
+    "int4",
+    "text",
+    "text",
+    "text",
+    "int8",
+    "timestamptz",
+    "int8",
+]
+_INSERT_STAGED_RELEASES_SQL = (
+    """
+WITH batch AS (
+    SELECT * FROM release_stage
+),"""
+    + _INSERT_RELEASES_TAIL
+)
+
+
 def insert_release(
     conn: Any,
     norm_title: str | None = None,
@@ -638,6 +740,26 @@ def insert_release(
             )
         )
 
+    if cleaned and not conn.__class__.__module__.startswith("sqlite3"):
+        try:
+            if len(cleaned) >= RELEASE_COPY_MIN_ROWS and hasattr(cur, "copy"):
+                cur.execute(_RELEASE_STAGE_SQL)
+                with cur.copy(_RELEASE_STAGE_COPY_SQL) as copy:
+                    copy.set_types(_RELEASE_STAGE_TYPES)
+                    for ordinal, row in enumerate(cleaned, start=1):
+                        copy.write_row((*row, ordinal))
+                cur.execute(_INSERT_STAGED_RELEASES_SQL)
+            else:
+                cur.execute(_INSERT_RELEASES_SQL, [list(col) for col in zip(*cleaned)])
+            inserted = {row[0] for row in cur.fetchall()}
+        except db_errors:  # type: ignore[misc]
+            # Fall back to the row-by-row path so one bad row only skips itself.
+            conn.rollback()
+            cur = conn.cursor()
+        else:
+            conn.commit()
+            return inserted
+
     placeholder = sql_placeholder(conn)
     placeholders = ",".join([placeholder] * len(titles))
     existing: set[tuple[str, int]] = set()
@@ -761,6 +883,17 @@ def prune_non_curated_groups(conn: Any, groups: Iterable[str]) -> None:
     conn.commit()
 
 
+@lru_cache(maxsize=1024)
+def _group_hint(group: str) -> Optional[str]:
+    """Return the ``HINT_TOKEN_MAP`` category hinted by ``group``, if any.
+
+    Every article of a group shares the answer, so it is cached per group
+    rather than recomputed for each new subject.
+    """
+    match = GROUP_HINT_RE.search(group.lower())
+    return HINT_TOKEN_MAP[match.group()] if match else None
+
+
 @lru_cache(maxsize=4096)
 def _infer_category(
     subject: str,
@@ -770,10 +903,8 @@ def _infer_category(
     s = subject.lower()
 
     if group:
-        g = group.lower()
-        match = GROUP_HINT_RE.search(g)
-        if match:
-            cat = HINT_TOKEN_MAP[match.group()]
+        cat = _group_hint(group)
+        if cat:
             if cat == "xxx":
                 if "dvd" in s:
                     return CATEGORY_MAP["xxx_dvd"]
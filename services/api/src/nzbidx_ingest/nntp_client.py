@@ -215,6 +215,43 @@ class NNTPClient:
         return []
 
     # ------------------------------------------------------------------
+    def body_sizes(self, group: str, start: int, end: int) -> dict[str, int]:
+        """Return article sizes in ``group`` between ``start`` and ``end``.
+
+        Two ``XHDR`` commands cover the whole range, so callers missing sizes
+        for several articles avoid one :meth:`body_size` round trip each. The
+        result maps message-ids (without angle brackets) to the ``Bytes``
+        header; it is empty when the server does not provide that header.
+        """
+        if not self.host:
+            return {}
+        try:
+            server = self._ensure_connection()
+            if server is None:
+                return {}
+            if self._current_group != group:
+                server.group(group)
+                self._current_group = group
+            span = f"{start}-{end}"
+            _resp, sizes = server.xhdr("Bytes", span)
+            if not sizes:
+                return {}
+            _resp, ids = server.xhdr("Message-ID", span)
+        except Exception:  # pragma: no cover - network failure
+            return {}
+        by_number: dict[str, int] = {}
+        for number, value in sizes:
+            try:
+                by_number[str(number)] = int(str(value).strip())
+            except ValueError:
+                continue
+        result: dict[str, int] = {}
+        for number, message_id in ids:
+            size = by_number.get(str(number), 0)
+            if size > 0:
+                result[str(message_id).strip().strip("<>")] = size
+        return result
+
     def body_size(self, message_id: str) -> int:
         """Return the size in bytes of ``message_id``."""
         if not self.host:
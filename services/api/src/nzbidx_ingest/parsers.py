@@ -6,6 +6,8 @@ import logging
 import re
 import subprocess
 import sys
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
 from functools import lru_cache
 from typing import Optional
 
@@ -19,6 +21,12 @@ LANGUAGE_TOKENS: dict[str, str] = {
 }
 
 _TAG_RE = re.compile(r"\[([^\[\]]+)\]")
+_TAG_SPLIT_RE = re.compile(r"[\s,]+")
+_LANGUAGE_TOKEN_RE = (
+    re.compile("|".join(map(re.escape, LANGUAGE_TOKENS)), re.IGNORECASE)
+    if LANGUAGE_TOKENS
+    else None
+)
 
 # Regexes used to sanitize text before automatic language detection. We strip
 # URLs and anything that is not an ASCII letter so short subjects with a lot of
@@ -29,6 +37,8 @@ _NON_LETTER_RE = re.compile(r"[^A-Za-z\s]+")
 # Precompiled regular expressions for tag extraction and subject normalization.
 _AUDIO_FORMATS = "|".join(AUDIO_EXTENSIONS)
 _BOOK_FORMATS = "|".join(BOOK_EXTENSIONS)
+_AUDIO_EXTENSIONS_LOWER = tuple(ext.lower() for ext in AUDIO_EXTENSIONS)
+_BOOK_EXTENSIONS_LOWER = tuple(ext.lower() for ext in BOOK_EXTENSIONS)
 
 MUSIC_TAG_RE = re.compile(
     rf"(?P<artist>[^-]+)-(?P<album>[^-]+)-(?P<year>\d{{4}})-"
@@ -112,7 +122,7 @@ def extract_tags(subject: str) -> list[str]:
     tags: list[str] = []
     for match in _TAG_RE.finditer(subject):
         content = match.group(1)
-        for tag in re.split(r"[\s,]+", content):
+        for tag in _TAG_SPLIT_RE.split(content):
             tag = tag.strip().lower()
             if tag:
                 tags.append(tag)
@@ -130,6 +140,51 @@ def extract_file_extension(subject: str) -> str | None:
 _SEGMENT_RE = re.compile(r"\((\d+)/\d+\)")
 
 
+_MONTHS = {
+    name: number
+    for number, name in enumerate(
+        "jan feb mar apr may jun jul aug sep oct nov dec".split(), start=1
+    )
+}
+
+# ``Day, DD Mon YYYY HH:MM[:SS] zone`` as sent by virtually every NNTP server.
+_HEADER_DATE_RE = re.compile(
+    r"\s*(?:[A-Za-z]{3},\s*)?(\d{1,2})\s+([A-Za-z]{3})\s+(\d{4})\s+"
+    r"(\d{1,2}):(\d{2})(?::(\d{2}))?\s+"
+    r"(?:([+-])(\d{2})(\d{2})|GMT|UTC|UT|Z)(?:\s*\([^)]*\))?\s*$",
+    re.IGNORECASE,
+)
+
+
+def parse_header_date(value: str) -> datetime:
+    """Return the RFC 2822 date ``value`` as an aware UTC ``datetime``.
+
+    The common header form is matched with a single precompiled regex; any
+    other input falls back to :func:`email.utils.parsedate_to_datetime`.
+    Raises ``ValueError`` or ``TypeError`` when ``value`` cannot be parsed.
+    """
+    match = _HEADER_DATE_RE.match(value)
+    if match:
+        day, mon, year, hour, minute, second, sign, off_h, off_m = match.groups()
+        month = _MONTHS.get(mon.lower())
+        # ``-0000`` means "unknown zone"; leave it to the stdlib semantics.
+        if month is not None and not (sign == "-" and off_h == off_m == "00"):
+            dt = datetime(
+                int(year),
+                month,
+                int(day),
+                int(hour),
+                int(minute),
+                int(second or 0),
+                tzinfo=timezone.utc,
+            )
+            if sign:
+                offset = timedelta(hours=int(off_h), minutes=int(off_m))
+                dt = dt - offset if sign == "+" else dt + offset
+            return dt
+    return parsedate_to_datetime(value).astimezone(timezone.utc)
+
+
 def extract_segment_number(subject: str) -> int:
     """Return the segment number parsed from ``subject`` if possible."""
     match = _SEGMENT_RE.search(subject)
@@ -293,9 +348,8 @@ def _normalize_cached(subject: str, lowercase: bool) -> str:
     cleaned = _TAG_RE.sub("", cleaned)
     cleaned = YENC_RE.sub("", cleaned)
     cleaned = PART_SIZE_RE.sub("", cleaned)
-    if LANGUAGE_TOKENS:
-        tokens_pattern = "|".join(map(re.escape, LANGUAGE_TOKENS.keys()))
-        cleaned = re.sub(tokens_pattern, "", cleaned, flags=re.IGNORECASE)
+    if _LANGUAGE_TOKEN_RE is not None:
+        cleaned = _LANGUAGE_TOKEN_RE.sub("", cleaned)
     cleaned = FILLER_RE.sub("", cleaned)
     cleaned = PART_RE.sub("", cleaned)
     cleaned = ARCHIVE_RE.sub("", cleaned)
@@ -330,10 +384,10 @@ def normalize_subject(
     lower_subject = subject.lower()
     tag_dict: dict[str, str] = {}
 
-    if any(ext.lower() in lower_subject for ext in AUDIO_EXTENSIONS):
+    if any(ext in lower_subject for ext in _AUDIO_EXTENSIONS_LOWER):
         tag_dict.update(extract_music_tags(subject))
 
-    if any(ext.lower() in lower_subject for ext in BOOK_EXTENSIONS):
+    if any(ext in lower_subject for ext in _BOOK_EXTENSIONS_LOWER):
         tag_dict.update(extract_book_tags(subject))
 
     if any(
@@ -9,6 +9,8 @@ EXPECTED_SEGMENT_KEYS = {"number", "message_id", "group", "size"}
 
 def _contains_surrogate(text: str) -> bool:
     """Return ``True`` if ``text`` contains Unicode surrogate code points."""
+    if text.isascii():
+        return False
     return any(0xD800 <= ord(ch) <= 0xDFFF for ch in text)
 
 
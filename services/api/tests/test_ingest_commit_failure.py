@@ -35,6 +35,7 @@ class DummyClient:
 def test_commit_failure_logged_and_propagated(monkeypatch, caplog) -> None:
     monkeypatch.setattr(loop.cursors, "get_cursor", lambda _g: 0)
     monkeypatch.setattr(loop.cursors, "set_cursor", lambda _g, _c: None)
+    monkeypatch.setattr(loop.cursors, "set_cursors", lambda _u: None)
 
     db = FailingDB()
     client = DummyClient()
@@ -23,6 +23,8 @@ async def _run_apply_schema(monkeypatch) -> list[str]:
             return (None,)
 
         def fetchall(self):  # pragma: no cover - trivial
+            if "pg_class" in self.sql:
+                return [("release_movies", self.state["partitioned"])]
             return []
 
     class RawConn:
@@ -1,5 +1,7 @@
+import re
 import sys
 from pathlib import Path
+from unittest import mock
 
 ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
@@ -19,3 +21,23 @@ def _clear_validate_cache() -> None:
     """Ensure NNTP config validation cache is reset between tests."""
 
     api_config.clear_validate_cache()
+
+
+_DOLLAR_QUOTED_RE = re.compile(r"\$\$.*?\$\$", re.S)
+
+
+@pytest.fixture
+def prepared_cursor() -> mock.Mock:
+    """Mock cursor that rejects multi-command SQL.
+
+    SQLAlchemy's asyncpg adapter prepares every statement, and PostgreSQL
+    refuses to prepare more than one command at a time.
+    """
+
+    def _execute(sql: str, *_args: object) -> None:
+        if ";" in _DOLLAR_QUOTED_RE.sub("", sql).strip().rstrip(";"):
+            raise Exception("cannot insert multiple commands into a prepared statement")
+
+    cur = mock.Mock()
+    cur.execute.side_effect = _execute
+    return cur
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import json
+import sqlite3
+
+import nzbidx_ingest.ingest_loop as loop  # type: ignore
+from nzbidx_ingest import config, cursors  # type: ignore
+from nzbidx_ingest.ingest_loop import _clean_text
+
+
+def test_clean_text_returns_clean_ascii_unchanged():
+    s = "Some.Release.Name.2024.1080p <part1of10@example>"
+    assert _clean_text(s) is s
+
+
+def test_clean_text_strips_nul_and_surrogates():
+    assert _clean_text("abc\x00def") == "abcdef"
+    assert _clean_text("café\ud800\x00") == "café"
+
+
+def test_ingest_cleans_only_server_fields(monkeypatch, tmp_path) -> None:
+    monkeypatch.setattr(config, "get_nntp_groups", lambda: ["alt.test"])
+    monkeypatch.setattr(loop, "get_group_mode", lambda: "curated")
+    monkeypatch.setattr(cursors, "reset_for_curated", lambda: False)
+    monkeypatch.setattr(loop, "prune_non_curated_groups", lambda _db, _g: None)
+    monkeypatch.setattr(cursors, "get_cursor", lambda _g: 0)
+    monkeypatch.setattr(cursors, "set_cursor", lambda _g, _c: None)
+    monkeypatch.setattr(cursors, "set_cursors", lambda _u: None)
+    monkeypatch.setattr(cursors, "mark_irrelevant", lambda _g: None)
+    monkeypatch.setattr(cursors, "get_irrelevant_groups", lambda: set())
+
+    class DummyClient:
+        def high_water_mark(self, group: str) -> int:
+            return 1
+
+        def xover(self, group: str, start: int, end: int):
+            return [
+                {
+                    "subject": "Alpha [FRENCH] (1/1)",
+                    ":bytes": "100",
+                    "message-id": "<a\x00>",
+                    "date": "Mon, 01 Jan 2024 12:34:56 +0000",
+                }
+            ]
+
+    cleaned: list[str] = []
+
+    def _recording_clean(s: str) -> str:
+        cleaned.append(s)
+        return _clean_text(s)
+
+    monkeypatch.setattr(loop, "_clean_text", _recording_clean)
+    db_path = tmp_path / "db.sqlite"
+
+    def _connect() -> sqlite3.Connection:
+        conn = sqlite3.connect(db_path)
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS release (norm_title TEXT, category TEXT, category_id INT, language TEXT, tags TEXT, source_group TEXT, size_bytes BIGINT, posted_at TIMESTAMPTZ, segments TEXT, has_parts INT NOT NULL DEFAULT 0, part_count INT NOT NULL DEFAULT 0, UNIQUE (norm_title, category_id, posted_at))"
+        )
+        return conn
+
+    monkeypatch.setattr(loop, "connect_db", _connect)
+
+    loop.run_once(DummyClient())
+
+    assert cleaned == ["alt.test", "<a\x00>", "Alpha [FRENCH] (1/1)", "alpha"]
+    with sqlite3.connect(db_path) as check:
+        segments = check.execute("SELECT segments FROM release").fetchone()[0]
+    assert [seg["message_id"] for seg in json.loads(segments)] == ["a"]
@@ -12,6 +12,16 @@ import nzbidx_ingest.cursors as cursors
 import nzbidx_ingest.config as config
 
 
+@pytest.fixture(autouse=True)
+def _fresh_cursor_connection():
+    """Drop any connection or lookups cached by a previous test."""
+    cursors.close_connection()
+    cursors._clear_caches()
+    yield
+    cursors.close_connection()
+    cursors._clear_caches()
+
+
 def test_cursor_db_path_created(tmp_path, monkeypatch):
     db_path = tmp_path / "subdir" / "cursors.sqlite"
     monkeypatch.setenv("CURSOR_DB", str(db_path))
@@ -28,15 +38,16 @@ def test_cursor_postgres_dsn(monkeypatch):
     storage: dict[str, int] = {}
 
     class DummyConn:
-        def execute(self, stmt: str, params: tuple | None = None):
+        def execute(self, stmt: str, params: tuple | None = None, **_kwargs):
             executed.append((stmt, params))
             if stmt.startswith("INSERT") and params:
                 storage[params[0]] = params[1]
             if stmt.startswith("SELECT") and params:
-                value = storage.get(params[0])
+                groups = params[0] if isinstance(params[0], list) else [params[0]]
+                found = [(g, storage[g]) for g in groups if g in storage]
                 return types.SimpleNamespace(
-                    fetchone=lambda: (value,),
-                    fetchall=lambda: [(params[0], value)] if value is not None else [],
+                    fetchone=lambda: (found[0][1],) if found else None,
+                    fetchall=lambda: found,
                 )
             return types.SimpleNamespace(fetchone=lambda: None, fetchall=lambda: [])
 
@@ -79,11 +90,17 @@ def test_cursor_postgres_dsn(monkeypatch):
     importlib.reload(cursors)
 
     cursors.set_cursor("alt.example", 99)
+    # Force the read to reach the database rather than the write-through cache.
+    cursors._clear_caches()
     assert cursors.get_cursor("alt.example") == 99
     assert executed[0] == ("url", "postgresql://user@host/db")
     insert_stmt = next(stmt for stmt, _ in executed if stmt.startswith("INSERT"))
-    select_stmt = next(stmt for stmt, _ in executed if stmt.startswith("SELECT"))
+    select_stmt = next(
+        stmt for stmt, _ in executed if stmt.startswith('SELECT "group"')
+    )
     assert "%s" in insert_stmt and "%s" in select_stmt
+    assert "ANY(%s)" in select_stmt
+    assert "pg_advisory_xact_lock" in executed[1][0]
 
 
 def test_bulk_cursor_helpers(tmp_path, monkeypatch):
@@ -97,6 +114,17 @@ def test_bulk_cursor_helpers(tmp_path, monkeypatch):
     assert result == {"g1": 1, "g2": 2}
 
 
+def test_get_cursors_chunks_large_in_list(tmp_path, monkeypatch):
+    db_path = tmp_path / "chunks.sqlite"
+    monkeypatch.setenv("CURSOR_DB", str(db_path))
+    importlib.reload(config)
+    importlib.reload(cursors)
+
+    updates = {f"g{i}": i for i in range(1500)}
+    cursors.set_cursors(updates)
+    assert cursors.get_cursors(list(updates) + ["missing"]) == updates
+
+
 def test_conn_sqlite_path_no_name_error(tmp_path, monkeypatch):
     db_path = tmp_path / "conn.sqlite"
     monkeypatch.setenv("CURSOR_DB", str(db_path))
@@ -127,6 +155,9 @@ def test_set_cursors_logs_error_on_failure(monkeypatch, caplog):
         def cursor(self):
             return self.DummyCursor()
 
+        def execute(self, stmt, params=None):
+            return None
+
         def commit(self) -> None:  # pragma: no cover - not reached
             pass
 
@@ -195,5 +226,146 @@ def test_conn_multiple_calls_no_duplicate_postgres(monkeypatch, caplog):
         conn2, _ = cursors._conn()
         conn2.close()
     assert not caplog.records
-    alter_stmts = [stmt for stmt in executed if stmt.startswith("ALTER TABLE cursor")]
-    assert all("IF NOT EXISTS" in stmt for stmt in alter_stmts)
+    alter_stmts = [stmt for stmt in executed if "ALTER TABLE cursor" in stmt]
+    assert alter_stmts
+    assert all("ADD COLUMN IF NOT EXISTS" in stmt for stmt in alter_stmts)
+
+
+def test_conn_bootstraps_schema_once(tmp_path, monkeypatch):
+    db_path = tmp_path / "once.sqlite"
+    monkeypatch.setenv("CURSOR_DB", str(db_path))
+    importlib.reload(config)
+    importlib.reload(cursors)
+    calls: list[bool] = []
+    original = cursors._ensure_schema
+
+    def tracking(conn, postgres):
+        calls.append(postgres)
+        original(conn, postgres)
+
+    monkeypatch.setattr(cursors, "_ensure_schema", tracking)
+    cursors.set_cursor("g", 1)
+    cursors.mark_irrelevant("h")
+    assert cursors.get_cursor("g") == 1
+    assert cursors.get_irrelevant_groups() == ["h"]
+    assert calls == [False]
+
+
+def test_mark_irrelevant_many(tmp_path, monkeypatch):
+    db_path = tmp_path / "irrelevant.sqlite"
+    monkeypatch.setenv("CURSOR_DB", str(db_path))
+    importlib.reload(config)
+    importlib.reload(cursors)
+
+    cursors.set_cursors({"g1": 5, "g2": 6})
+    cursors.mark_irrelevant_many(["g1", "g3"])
+    cursors.mark_irrelevant_many([])
+    assert sorted(cursors.get_irrelevant_groups()) == ["g1", "g3"]
+    assert cursors.get_cursors(["g1", "g2", "g3"]) == {"g2": 6}
+
+
+def test_set_cursors_postgres_large_batch_uses_copy(monkeypatch):
+    executed: list[str] = []
+    copied: list[tuple] = []
+
+    class DummyCopy:
+        def __enter__(self):
+            return self
+
+        def __exit__(self, exc_type, exc, tb):
+            return False
+
+        def write_row(self, row):
+            copied.append(row)
+
+    class DummyCursor:
+        def __enter__(self):
+            return self
+
+        def __exit__(self, exc_type, exc, tb):
+            return False
+
+        def execute(self, stmt, params=None):
+            executed.append(stmt)
+
+        def executemany(self, stmt, params):  # pragma: no cover - not reached
+            raise AssertionError("executemany should not be used")
+
+        def copy(self, stmt):
+            executed.append(stmt)
+            return DummyCopy()
+
+    class DummyConn:
+        def cursor(self):
+            return DummyCursor()
+
+        def commit(self) -> None:
+            executed.append("COMMIT")
+
+        def close(self) -> None:
+            return None
+
+    monkeypatch.setattr(cursors, "_conn", lambda: (DummyConn(), "%s"))
+    updates = {f"g{i}": i for i in range(cursors._COPY_THRESHOLD + 1)}
+    cursors.set_cursors(updates)
+
+    assert copied == list(updates.items())
+    assert executed[0].startswith("CREATE TEMP TABLE")
+    assert executed[1].startswith("COPY cursor_stage")
+    assert executed[2].startswith("INSERT INTO cursor")
+    assert executed[-1] == "COMMIT"
+
+
+def test_cursor_connection_is_reused(tmp_path, monkeypatch):
+    db_path = tmp_path / "reuse.sqlite"
+    monkeypatch.setenv("CURSOR_DB", str(db_path))
+    importlib.reload(config)
+    importlib.reload(cursors)
+    opened: list[object] = []
+    original = cursors._conn
+
+    def tracking():
+        result = original()
+        opened.append(result[0])
+        return result
+
+    monkeypatch.setattr(cursors, "_conn", tracking)
+    cursors.set_cursor("g", 1)
+    cursors.mark_irrelevant("h")
+    assert cursors.get_cursor("g") == 1
+    assert cursors.get_irrelevant_groups() == ["h"]
+    assert len(opened) == 1
+
+    other = tmp_path / "other.sqlite"
+    monkeypatch.setattr(cursors, "CURSOR_DB", str(other))
+    assert cursors.get_cursor("g") is None
+    assert len(opened) == 2
+
+
+def test_cursor_lookups_are_cached(tmp_path, monkeypatch):
+    db_path = tmp_path / "cached.sqlite"
+    monkeypatch.setenv("CURSOR_DB", str(db_path))
+    importlib.reload(config)
+    importlib.reload(cursors)
+
+    cursors.set_cursor("g", 1)
+    cursors.mark_irrelevant("h")
+    assert cursors.get_cursor("g") == 1
+    assert cursors.get_irrelevant_groups() == ["h"]
+
+    original = cursors._connection
+
+    def fail():
+        raise AssertionError("database should not be queried")
+
+    monkeypatch.setattr(cursors, "_connection", fail)
+    assert cursors.get_cursor("g") == 1
+    assert cursors.get_cursor("h") is None
+    assert cursors.get_irrelevant_groups() == ["h"]
+
+    monkeypatch.setattr(cursors, "_connection", original)
+    cursors.set_cursor("h", 5)
+    assert cursors.get_cursor("h") == 5
+    assert cursors.get_irrelevant_groups() == []
+    cursors.reset()
+    assert cursors.get_cursor("g") is None
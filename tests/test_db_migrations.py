@@ -1,7 +1,9 @@
 from __future__ import annotations
 
+import uuid
 from unittest import mock
 
+import pytest
 from nzbidx_ingest.db_migrations import create_release_posted_at_index
 
 
@@ -10,19 +12,423 @@ def test_create_release_posted_at_index_retries(monkeypatch):
     cur = mock.Mock()
     conn.cursor.return_value = cur
 
-    # Initial existence check succeeds, partition query fails, fallback succeeds
-    cur.execute.side_effect = [None, Exception("boom"), None]
-    cur.fetchone.return_value = ("release",)
+    # Partition query fails, fallback succeeds
+    cur.execute.side_effect = [Exception("boom"), None]
 
     create_release_posted_at_index(conn)
 
     # rollback is called after failure
     conn.rollback.assert_called_once()
     # fallback query executed
-    assert cur.execute.call_args_list[2][0][0] == (
+    assert cur.execute.call_args_list[1][0][0] == (
         "CREATE INDEX IF NOT EXISTS release_posted_at_idx ON release (posted_at)"
     )
     # commit called at end
     conn.commit.assert_called_once()
-    # initial partition query attempted after existence check
-    assert "FROM pg_inherits" in cur.execute.call_args_list[1][0][0]
+    # partition query attempted first
+    assert "FROM pg_inherits" in cur.execute.call_args_list[0][0][0]
+
+
+def test_migrate_release_table_creates_partitions_before_copying(prepared_cursor):
+    from nzbidx_ingest import db_migrations
+
+    conn = mock.Mock()
+    cur = prepared_cursor
+    conn.cursor.return_value = cur
+    # ``release`` exists, is not partitioned and is empty; later lookups find
+    # nothing.
+    cur.fetchone.side_effect = [(1, None), (None, None, 0, None)]
+    cur.fetchall.return_value = []
+
+    db_migrations.migrate_release_table(conn)
+
+    stmts = [c[0][0] for c in cur.execute.call_args_list]
+    create = next(i for i, s in enumerate(stmts) if "CREATE TABLE release_new" in s)
+    ddl = [s for s in stmts[create:] if "PARTITION OF release" in s]
+    assert len(ddl) == 3 * len(db_migrations.DATED_CATEGORIES) + 1
+    # Partition key columns are only added when the catalog lacks them.
+    prepare = next(s for s in stmts if "string_agg(format('ADD COLUMN" in s)
+    assert "ADD COLUMN IF NOT EXISTS" not in prepare
+    assert (
+        "CREATE TABLE IF NOT EXISTS release_books_default PARTITION OF "
+        "release_books DEFAULT" in ddl
+    )
+    assert any("release_other PARTITION OF release_new DEFAULT" in s for s in ddl)
+    # Indexes are built only after the rows have been copied.
+    last_copy = max(i for i, s in enumerate(stmts) if "WHERE id <=" in s)
+    gin = next(i for i, s in enumerate(stmts) if "USING GIN" in s)
+    assert gin > last_copy
+    unique = next(i for i, s in enumerate(stmts) if "UNIQUE" in s)
+    assert unique > last_copy
+    # Writers are held off from before the copy; the live table is only
+    # locked exclusively for the final swap.
+    first_copy = min(i for i, s in enumerate(stmts) if "WHERE id <=" in s)
+    share = stmts.index("LOCK TABLE release IN SHARE MODE")
+    assert share < first_copy
+    swap = stmts.index("LOCK TABLE release IN ACCESS EXCLUSIVE MODE")
+    assert swap > gin
+    assert "ALTER TABLE release_new RENAME TO release" in stmts[swap:]
+
+
+def test_migrate_release_partitions_by_date_resumes_after_last_id(
+    monkeypatch, prepared_cursor
+):
+    from nzbidx_ingest import db_migrations
+
+    conn = mock.Mock()
+    cur = prepared_cursor
+    conn.cursor.return_value = cur
+    monkeypatch.setattr(
+        db_migrations, "create_release_posted_at_index", lambda _conn: None
+    )
+    # Not yet partitioned by date; two batches report their highest id and an
+    # empty one reports none.
+    cur.fetchone.side_effect = [None, (2,), (3,), (None,)]
+
+    db_migrations.migrate_release_partitions_by_date(conn, "movies", batch_size=2)
+
+    moves = [c for c in cur.execute.call_args_list if "WITH moved AS" in c[0][0]]
+    assert len(moves) == 3
+    assert "WHERE id >" not in moves[0][0][0]
+    assert moves[1][0][1] == (2,)
+    assert moves[2][0][1] == (3,)
+    # The old table is dropped afterwards, so batches are never deleted from it.
+    assert not any("DELETE" in c[0][0] for c in moves)
+    assert any(
+        "release_movies_old_id_idx" in c[0][0] for c in cur.execute.call_args_list
+    )
+    years = [c for c in cur.execute.call_args_list if "FOR y IN" in c[0][0]]
+    assert len(years) == 1
+    assert "WITH RECURSIVE years" in years[0][0][0]
+    assert "generate_series" not in years[0][0][0]
+    assert "FROM release_movies_old" in years[0][0][0]
+    executed = [c[0][0] for c in cur.execute.call_args_list]
+    assert executed[-3:] == [
+        "DROP TABLE release_movies_old",
+        "ALTER TABLE release_movies ALTER COLUMN norm_title SET STATISTICS 1000, "
+        "ALTER COLUMN category_id SET STATISTICS 1000",
+        "ANALYZE release_movies",
+    ]
+
+
+def test_migrate_release_partitions_by_date_finishes_interrupted_move(
+    prepared_cursor,
+):
+    from nzbidx_ingest import db_migrations
+
+    conn = mock.Mock()
+    cur = prepared_cursor
+    conn.cursor.return_value = cur
+    # Already partitioned with the old table still present; rows up to id 7
+    # were copied before the interruption.
+    cur.fetchone.side_effect = [(1,), (7,), (9,), (None,)]
+    cur.fetchall.return_value = [(1,)]
+
+    db_migrations.migrate_release_partitions_by_date(conn, "movies", batch_size=2)
+
+    executed = [c[0][0] for c in cur.execute.call_args_list]
+    assert not any("DETACH PARTITION" in s for s in executed)
+    assert "SELECT max(id) FROM release_movies " in executed[2]
+    moves = [c for c in cur.execute.call_args_list if "WITH moved AS" in c[0][0]]
+    assert [c[0][1] for c in moves] == [(7,), (9,)]
+    assert executed[-3] == "DROP TABLE release_movies_old"
+    conn.commit.assert_called_once()
+
+
+def test_migrate_release_partitions_by_date_skips_finished_table(prepared_cursor):
+    from nzbidx_ingest import db_migrations
+
+    conn = mock.Mock()
+    cur = prepared_cursor
+    conn.cursor.return_value = cur
+    cur.fetchone.return_value = (1,)
+    cur.fetchall.return_value = []
+
+    db_migrations.migrate_release_partitions_by_date(conn, "movies")
+
+    assert cur.execute.call_count == 2
+    conn.commit.assert_not_called()
+
+
+def test_posted_at_years_skip_empty_years(monkeypatch):
+    from nzbidx_ingest import db_migrations
+
+    psycopg = pytest.importorskip("psycopg")
+    dbname = f"test_{uuid.uuid4().hex}"
+    monkeypatch.setenv("PGHOST", "/var/run/postgresql")
+    try:
+        admin = psycopg.connect(dbname="postgres", user="root", autocommit=True)
+        admin.execute(f'CREATE DATABASE "{dbname}"')
+    except psycopg.OperationalError as exc:  # pragma: no cover - env specific
+        pytest.skip(f"PostgreSQL unavailable: {exc}")
+
+    try:
+        with psycopg.connect(dbname=dbname, user="root") as conn:
+            conn.execute("SET TIME ZONE 'UTC'")
+            conn.execute("CREATE TABLE release_movies_old (posted_at TIMESTAMPTZ)")
+            conn.execute(
+                "INSERT INTO release_movies_old VALUES "
+                "('1901-06-01'), ('2023-03-01'), ('2023-09-01'), ('2024-01-01'), "
+                "(NULL)"
+            )
+            sql = db_migrations._posted_at_years_sql("release_movies_old")
+            assert [y for (y,) in conn.execute(sql)] == [1901, 2023, 2024]
+    finally:
+        admin.execute(f'DROP DATABASE IF EXISTS "{dbname}"')
+        admin.close()
+
+
+def test_bulk_load_settings_are_one_command(prepared_cursor):
+    from nzbidx_ingest import db_migrations
+
+    prepared_cursor.execute(db_migrations._BULK_LOAD_SETTINGS_SQL)
+    assert "SET LOCAL" not in db_migrations._BULK_LOAD_SETTINGS_SQL
+
+
+def test_bulk_load_settings_keep_server_index_build_limits(monkeypatch):
+    from nzbidx_ingest import db_migrations
+
+    sql = db_migrations._bulk_load_settings_sql()
+    assert "maintenance_work_mem" not in sql
+    assert "max_parallel_maintenance_workers" not in sql
+
+    monkeypatch.setattr(db_migrations, "MIGRATION_MAINTENANCE_WORK_MEM", "256MB")
+    monkeypatch.setattr(
+        db_migrations, "MIGRATION_MAX_PARALLEL_MAINTENANCE_WORKERS", "2"
+    )
+    sql = db_migrations._bulk_load_settings_sql()
+    assert "set_config('maintenance_work_mem', '256MB', true)" in sql
+    assert "set_config('max_parallel_maintenance_workers', '2', true)" in sql
+
+    monkeypatch.setattr(db_migrations, "MIGRATION_MAINTENANCE_WORK_MEM", "1GB'$$")
+    monkeypatch.setattr(
+        db_migrations, "MIGRATION_MAX_PARALLEL_MAINTENANCE_WORKERS", "many"
+    )
+    sql = db_migrations._bulk_load_settings_sql()
+    assert "maintenance_work_mem" not in sql
+    assert "max_parallel_maintenance_workers" not in sql
+
+
+def test_create_release_posted_at_index_walks_tree_once(prepared_cursor):
+    conn = mock.Mock()
+    cur = prepared_cursor
+    conn.cursor.return_value = cur
+    cur.fetchall.return_value = [
+        ("release",),
+        ("release_movies",),
+        ("release_movies_2024",),
+    ]
+
+    create_release_posted_at_index(conn)
+
+    stmts = [c[0][0] for c in cur.execute.call_args_list]
+    assert sum("pg_inherits" in s for s in stmts) == 1
+    assert stmts[1:] == [
+        "CREATE INDEX IF NOT EXISTS release_posted_at_idx ON release (posted_at)",
+        "CREATE INDEX IF NOT EXISTS release_movies_posted_at_idx ON release_movies (posted_at)",
+        "CREATE INDEX IF NOT EXISTS release_movies_2024_posted_at_idx ON release_movies_2024 (posted_at)",
+    ]
+    conn.rollback.assert_not_called()
+    conn.commit.assert_called_once()
+
+
+def test_ensure_year_partitions_batches_categories(monkeypatch, prepared_cursor):
+    from nzbidx_ingest import db_migrations
+
+    conn = mock.Mock()
+    cur = prepared_cursor
+    conn.cursor.return_value = cur
+    cur.fetchall.return_value = [
+        ("release_movies", "RANGE (posted_at)"),
+        ("release_tv", "RANGE (posted_at)"),
+        ("release_books", None),
+    ]
+    migrated: list[tuple[str, int]] = []
+    monkeypatch.setattr(
+        db_migrations,
+        "ensure_release_year_partition",
+        lambda _conn, category, year: migrated.append((category, year)),
+    )
+
+    db_migrations.ensure_year_partitions(conn, 2030, ["movies", "tv", "books", "music"])
+
+    stmts = [c[0][0] for c in cur.execute.call_args_list[1:]]
+    assert stmts == [
+        db_migrations._PARTITION_LOCK_SQL,
+        "CREATE TABLE IF NOT EXISTS release_movies_2030 PARTITION OF release_movies FOR VALUES FROM ('2030-01-01') TO ('2031-01-01')",
+        "CREATE INDEX IF NOT EXISTS release_movies_2030_posted_at_idx ON release_movies_2030 (posted_at)",
+        "CREATE TABLE IF NOT EXISTS release_tv_2030 PARTITION OF release_tv FOR VALUES FROM ('2030-01-01') TO ('2031-01-01')",
+        "CREATE INDEX IF NOT EXISTS release_tv_2030_posted_at_idx ON release_tv_2030 (posted_at)",
+    ]
+    assert migrated == [("books", 2030)]
+    conn.commit.assert_called_once()
+
+
+def test_current_and_next_year_partitions_share_one_transaction(
+    monkeypatch, prepared_cursor
+):
+    from nzbidx_ingest import db_migrations
+
+    db_migrations._forget_partitions()
+    conn = mock.Mock()
+    cur = prepared_cursor
+    conn.cursor.return_value = cur
+    cur.fetchall.return_value = [
+        (f"release_{c}", "RANGE (posted_at)") for c in db_migrations.DATED_CATEGORIES
+    ]
+
+    db_migrations.ensure_current_and_next_year_partitions(conn)
+
+    year = db_migrations.datetime.now().year
+    stmts = [c[0][0] for c in cur.execute.call_args_list]
+    assert stmts[1] == db_migrations._PARTITION_LOCK_SQL
+    for category in db_migrations.DATED_CATEGORIES:
+        for y in (year, year + 1):
+            assert any(
+                s.startswith(f"CREATE TABLE IF NOT EXISTS release_{category}_{y} ")
+                for s in stmts
+            )
+    conn.commit.assert_called_once()
+    db_migrations._forget_partitions()
+
+
+def test_migrate_release_table_copies_partitions_server_side(monkeypatch):
+    from nzbidx_ingest import db_migrations
+
+    conn = mock.Mock()
+    cur = mock.Mock()
+    conn.cursor.return_value = cur
+    # Rows span several categories, so they are copied rather than attached.
+    cur.fetchone.side_effect = [(1, None), (2000, 5030, 0, 42)]
+    monkeypatch.setattr(
+        db_migrations, "create_release_posted_at_index", lambda _conn: None
+    )
+
+    db_migrations.migrate_release_table(conn)
+
+    stmts = [c[0][0] for c in cur.execute.call_args_list]
+    copies = [s for s in stmts if "WHERE id <=" in s]
+    assert len(copies) == len(db_migrations.CATEGORY_RANGES)
+    assert all("FROM release WHERE id <= 42 AND" in s for s in copies)
+
+
+def test_migrate_release_table_attaches_single_category(monkeypatch):
+    from nzbidx_ingest import db_migrations
+
+    conn = mock.Mock()
+    cur = mock.Mock()
+    conn.cursor.return_value = cur
+    # Every old row is a TV release.
+    cur.fetchone.side_effect = [(1, None), (5030, 5070, 0, 42)]
+    monkeypatch.setattr(
+        db_migrations, "create_release_posted_at_index", lambda _conn: None
+    )
+
+    db_migrations.migrate_release_table(conn)
+
+    stmts = [c[0][0] for c in cur.execute.call_args_list]
+    check = next(s for s in stmts if "ADD CONSTRAINT release_legacy_cat_chk" in s)
+    assert "category_id >= 5000 AND category_id < 6000" in check
+    assert "ALTER TABLE release RENAME TO release_tv_default" in stmts
+    assert "ALTER TABLE release_new RENAME TO release" in stmts
+    assert "ALTER TABLE release_tv ATTACH PARTITION release_tv_default DEFAULT" in stmts
+    assert not any("INSERT INTO release_" in s for s in stmts)
+    assert not any("OWNED BY release_new.id" in s for s in stmts)
+    assert conn.commit.call_count == 3
+    assert stmts[-1].endswith("ANALYZE release")
+
+
+def test_create_release_posted_at_index_skips_missing_table():
+    conn = mock.Mock()
+    cur = mock.Mock()
+    conn.cursor.return_value = cur
+    cur.fetchall.return_value = []
+
+    create_release_posted_at_index(conn)
+
+    assert cur.execute.call_count == 1
+    conn.rollback.assert_called_once()
+    conn.commit.assert_not_called()
+
+
+def test_ensure_release_year_partition_creates_in_one_round_trip():
+    from nzbidx_ingest import db_migrations
+
+    conn = mock.Mock()
+    conn.info.backend_pid = 4242
+    cur = mock.Mock()
+    conn.cursor.return_value = cur
+
+    db_migrations.ensure_release_year_partition(conn, "tv", 2031)
+    db_migrations.ensure_release_year_partition(conn, "tv", 2031)
+
+    stmts = [c[0][0] for c in cur.execute.call_args_list]
+    assert len(stmts) == 1
+    assert "pg_get_partkeydef('release_tv'::regclass)" in stmts[0]
+    assert "CREATE TABLE IF NOT EXISTS release_tv_2031" in stmts[0]
+    conn.commit.assert_called_once()
+
+    db_migrations._forget_partitions()
+    db_migrations.ensure_release_year_partition(conn, "tv", 2031)
+    assert cur.execute.call_count == 2
+
+
+def test_ensure_release_year_partition_indexes_existing_partition_concurrently():
+    from nzbidx_ingest import db_migrations
+
+    class MissingIndex(Exception):
+        sqlstate = "55000"
+
+    conn = mock.Mock()
+    conn.info.backend_pid = 4343
+    conn.autocommit = False
+    cur = mock.Mock()
+    conn.cursor.return_value = cur
+    modes: list[bool] = []
+
+    def execute(sql, *args):
+        modes.append(conn.autocommit)
+        if len(modes) == 1:
+            raise MissingIndex()
+
+    cur.execute.side_effect = execute
+
+    db_migrations.ensure_release_year_partition(conn, "tv", 2032)
+
+    stmts = [c[0][0] for c in cur.execute.call_args_list]
+    assert stmts[1] == (
+        "CREATE INDEX CONCURRENTLY IF NOT EXISTS release_tv_2032_posted_at_idx "
+        "ON release_tv_2032 (posted_at)"
+    )
+    assert modes == [False, True]
+    assert conn.autocommit is False
+    conn.rollback.assert_called_once()
+
+    db_migrations.ensure_release_year_partition(conn, "tv", 2032)
+    assert cur.execute.call_count == 2
+    db_migrations._forget_partitions()
+
+
+def test_ensure_release_year_partition_migrates_unpartitioned_parent(monkeypatch):
+    from nzbidx_ingest import db_migrations
+
+    class WrongObjectType(Exception):
+        sqlstate = "42809"
+
+    conn = mock.Mock()
+    cur = mock.Mock()
+    conn.cursor.return_value = cur
+    cur.execute.side_effect = [WrongObjectType(), None]
+    migrated: list[str] = []
+    monkeypatch.setattr(
+        db_migrations,
+        "migrate_release_partitions_by_date",
+        lambda _conn, category: migrated.append(category),
+    )
+
+    db_migrations.ensure_release_year_partition(conn, "books", 2031)
+
+    assert migrated == ["books"]
+    conn.rollback.assert_called_once()
+    assert cur.execute.call_count == 2
+    conn.commit.assert_called_once()
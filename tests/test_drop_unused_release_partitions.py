@@ -6,7 +6,20 @@ def test_drop_unused_release_partitions(monkeypatch):
         "release_adult_keep": 0,
         "release_adult_drop": 0,
         "release_adult_used": 1,
+        "release_adult_stale": 0,
+        "release_adult_bloated": 0,
     }
+    # Planner row estimates; ``-1`` means the table was never analysed.
+    estimates = {
+        "release_adult_keep": 0.0,
+        "release_adult_drop": -1.0,
+        "release_adult_used": 0.0,
+        "release_adult_stale": 10.0,
+        "release_adult_bloated": 0.0,
+    }
+    # On-disk size in bytes; only single-block partitions are probed.
+    sizes = {"release_adult_bloated": 64 * 8192}
+    probed: list[str] = []
 
     class DummyCursor:
         def __init__(self, conn):
@@ -16,14 +29,25 @@ def test_drop_unused_release_partitions(monkeypatch):
         def execute(self, stmt, params=None):
             sql = " ".join(stmt.split())
             if "FROM pg_inherits" in sql:
-                self._result = [(name,) for name in self.conn.tables]
-            elif sql.startswith("SELECT 1 FROM"):
-                table = sql.split()[3]
-                count = self.conn.tables.get(table, 0)
-                self._result = [(1,)] if count > 0 else []
+                assert "pg_relation_size" in sql
+                _parent, retain = params
+                self._result = [
+                    (name,)
+                    for name in self.conn.tables
+                    if estimates[name] <= 0
+                    and sizes.get(name, 0) <= 8192
+                    and name not in retain
+                ]
+            elif "WHERE EXISTS" in sql:
+                tables = [
+                    part.split()[-1].rstrip(")") for part in sql.split(" UNION ALL ")
+                ]
+                probed.extend(tables)
+                self._result = [
+                    (table,) for table in tables if self.conn.tables.get(table, 0) > 0
+                ]
             elif sql.startswith("DROP TABLE"):
-                table = sql.split()[2]
-                self.conn.dropped.append(table)
+                self.conn.dropped.extend(sql[len("DROP TABLE ") :].split(", "))
                 self._result = []
             else:
                 self._result = []
@@ -54,3 +78,4 @@ def test_drop_unused_release_partitions(monkeypatch):
     drop_unused_release_partitions(conn, "adult")
 
     assert conn.dropped == ["release_adult_drop"]
+    assert probed == ["release_adult_drop", "release_adult_used"]
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import nzbidx_ingest.ingest_loop as loop  # type: ignore
+from nzbidx_ingest import config, cursors  # type: ignore
+
+
+def test_missing_sizes_fetched_once_per_batch(monkeypatch) -> None:
+    monkeypatch.setattr(config, "get_nntp_groups", lambda: ["alt.test"])
+    monkeypatch.setattr(loop, "get_group_mode", lambda: "curated")
+    monkeypatch.setattr(cursors, "reset_for_curated", lambda: False)
+    monkeypatch.setattr(loop, "prune_non_curated_groups", lambda _db, _g: None)
+    monkeypatch.setattr(cursors, "get_cursor", lambda _g: 0)
+    monkeypatch.setattr(cursors, "set_cursor", lambda _g, _c: None)
+    monkeypatch.setattr(cursors, "set_cursors", lambda _u: None)
+    monkeypatch.setattr(cursors, "mark_irrelevant", lambda _g: None)
+    monkeypatch.setattr(loop, "connect_db", lambda: None)
+    captured: list[tuple] = []
+    monkeypatch.setattr(
+        loop,
+        "insert_release",
+        lambda _db, releases: captured.extend(releases) or set(),
+    )
+
+    ranges: list[tuple[str, int, int]] = []
+    single: list[str] = []
+
+    class DummyClient:
+        def high_water_mark(self, group: str) -> int:
+            return 3
+
+        def xover(self, group: str, start: int, end: int):
+            return [
+                {"subject": "Alpha (1/3)", "message-id": "<a1>"},
+                {"subject": "Alpha (2/3)", "message-id": "<a2>"},
+                {"subject": "Alpha (3/3)", "message-id": "<a3>"},
+            ]
+
+        def body_sizes(self, group: str, start: int, end: int) -> dict[str, int]:
+            ranges.append((group, start, end))
+            return {"a1": 100, "a2": 200}
+
+        def body_size(self, message_id: str) -> int:
+            single.append(message_id)
+            return 300
+
+    loop.run_once(DummyClient())
+
+    assert ranges == [("alt.test", 1, 3)]
+    # The article the range lookup left out is skipped, not fetched singly.
+    assert single == []
+    assert [row[5] for row in captured] == [300]
+
+    # Servers that answer nothing for the range fall back per article.
+    monkeypatch.setattr(DummyClient, "body_sizes", lambda *_a: {})
+    captured.clear()
+    loop.run_once(DummyClient())
+    assert single == ["<a1>", "<a2>", "<a3>"]
+    assert [row[5] for row in captured] == [900]
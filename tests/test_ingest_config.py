@@ -73,3 +73,74 @@ def test_load_groups_uses_wildcard(monkeypatch) -> None:
     config._load_groups()
 
     assert called["pattern"] == "alt.custom.*"
+
+
+def test_allowed_extensions_for_category(monkeypatch) -> None:
+    """Category IDs map to their extension allow-list with one lookup."""
+    import nzbidx_ingest.config as config
+
+    assert (
+        config.allowed_extensions_for_category("2040")
+        is config.ALLOWED_MOVIE_EXTENSIONS
+    )
+    assert (
+        config.allowed_extensions_for_category("5000") is config.ALLOWED_TV_EXTENSIONS
+    )
+    assert (
+        config.allowed_extensions_for_category("6010")
+        is config.ALLOWED_ADULT_EXTENSIONS
+    )
+    assert config.allowed_extensions_for_category("3000") is None
+    assert config.allowed_extensions_for_category("other") is None
+    monkeypatch.setattr(config, "ALLOWED_TV_EXTENSIONS", None)
+    assert config.allowed_extensions_for_category("5030") is None
+
+
+def test_load_groups_reuses_cached_discovery(monkeypatch, tmp_path) -> None:
+    import nzbidx_ingest.config as config
+
+    calls = {"count": 0}
+
+    class DummyClient:
+        def __init__(self, _settings=None) -> None:
+            pass
+
+        def list_groups(self, _pattern):
+            calls["count"] += 1
+            return ["alt.binaries.tv", "alt.binaries.other"]
+
+    monkeypatch.delenv("NNTP_GROUPS", raising=False)
+    monkeypatch.setenv("NNTP_GROUP_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(config, "NNTP_GROUP_CACHE_TTL", 3600)
+    monkeypatch.setattr(config, "NNTP_GROUP_WILDCARD", "alt.cached.*")
+    monkeypatch.setattr(config, "NNTPClient", DummyClient)
+
+    assert config._load_groups("auto") == ["alt.binaries.tv"]
+    assert config._load_groups("auto") == ["alt.binaries.tv"]
+    assert calls["count"] == 1
+    assert (tmp_path / "CACHEDIR.TAG").exists()
+
+    monkeypatch.setattr(config, "NNTP_GROUP_CACHE_TTL", 0)
+    config._load_groups("auto")
+    assert calls["count"] == 2
+
+
+def test_group_cache_path_is_keyed_on_server(monkeypatch, tmp_path) -> None:
+    import dataclasses
+
+    import nzbidx_ingest.config as config
+
+    monkeypatch.setenv("NNTP_GROUP_CACHE_DIR", str(tmp_path))
+    settings = config.NNTP_SETTINGS
+    monkeypatch.setattr(
+        config, "NNTP_SETTINGS", dataclasses.replace(settings, host="a", port=119)
+    )
+    first = config._group_cache_path("alt.*")
+    monkeypatch.setattr(
+        config, "NNTP_SETTINGS", dataclasses.replace(settings, host="b", port=119)
+    )
+    assert config._group_cache_path("alt.*") != first
+    monkeypatch.setattr(
+        config, "NNTP_SETTINGS", dataclasses.replace(settings, host="a", port=563)
+    )
+    assert config._group_cache_path("alt.*") != first
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import sqlite3
+
+import nzbidx_ingest.ingest_loop as loop  # type: ignore
+from nzbidx_ingest import config, cursors  # type: ignore
+
+
+def test_cursors_flushed_in_one_batch(monkeypatch, tmp_path) -> None:
+    groups = ["alt.one", "alt.two", "alt.three"]
+    monkeypatch.setattr(config, "get_nntp_groups", lambda: list(groups))
+    monkeypatch.setattr(cursors, "get_cursor", lambda _g: 0)
+    single: list[tuple[str, int]] = []
+    batches: list[dict[str, int]] = []
+    monkeypatch.setattr(cursors, "set_cursor", lambda g, c: single.append((g, c)))
+    monkeypatch.setattr(cursors, "set_cursors", lambda u: batches.append(dict(u)))
+    monkeypatch.setattr(cursors, "mark_irrelevant", lambda _g: None)
+    monkeypatch.setattr(cursors, "get_irrelevant_groups", lambda: set())
+    monkeypatch.setattr(loop, "get_group_mode", lambda: "curated")
+    monkeypatch.setattr(cursors, "reset_for_curated", lambda: False)
+
+    class DummyClient:
+        def high_water_mark(self, group: str) -> int:
+            return 2
+
+        def xover(self, group: str, start: int, end: int):
+            return [
+                {"subject": f"{group} Example", ":bytes": "456"},
+                {"subject": f"{group} Other", ":bytes": "789"},
+            ]
+
+    db_path = tmp_path / "db.sqlite"
+
+    def _connect() -> sqlite3.Connection:
+        conn = sqlite3.connect(db_path)
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS release (norm_title TEXT, category TEXT, category_id INT, language TEXT, tags TEXT, source_group TEXT, size_bytes BIGINT, posted_at TIMESTAMPTZ, has_parts INT NOT NULL DEFAULT 0, part_count INT NOT NULL DEFAULT 0, UNIQUE (norm_title, category_id, posted_at))"
+        )
+        return conn
+
+    monkeypatch.setattr(loop, "connect_db", _connect)
+
+    loop.run_once(DummyClient())
+
+    assert single == []
+    assert batches == [{g: 2 for g in groups}]
+
+
+def test_irrelevant_group_cursor_after_flush(monkeypatch) -> None:
+    monkeypatch.setattr(config, "get_nntp_groups", lambda: ["alt.one"])
+    monkeypatch.setattr(loop, "get_group_mode", lambda: "auto")
+    monkeypatch.setattr(loop, "CURSOR_FLUSH_SIZE", 1)
+    monkeypatch.setattr(cursors, "mark_group_mode", lambda _m: None)
+    monkeypatch.setattr(cursors, "get_cursor", lambda _g: 0)
+    single: list[tuple[str, int]] = []
+    batches: list[dict[str, int]] = []
+    irrelevant: list[str] = []
+    monkeypatch.setattr(cursors, "set_cursor", lambda g, c: single.append((g, c)))
+    monkeypatch.setattr(cursors, "set_cursors", lambda u: batches.append(dict(u)))
+    monkeypatch.setattr(cursors, "mark_irrelevant", irrelevant.append)
+    monkeypatch.setattr(cursors, "get_irrelevant_groups", lambda: set())
+    monkeypatch.setattr(loop, "connect_db", lambda: None)
+    monkeypatch.setattr(loop, "insert_release", lambda _db, releases: set())
+
+    class DummyClient:
+        def high_water_mark(self, group: str) -> int:
+            return 2
+
+        def xover(self, group: str, start: int, end: int):
+            return [
+                {"subject": "Example", ":bytes": "456"},
+                {"subject": "Other", ":bytes": "789"},
+            ]
+
+    loop.run_once(DummyClient())
+
+    assert batches == [{"alt.one": 2}]
+    assert single == [("alt.one", 2)]
+    assert irrelevant == ["alt.one"]
@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import sqlite3
+import threading
+
+import nzbidx_ingest.ingest_loop as loop  # type: ignore
+from nzbidx_ingest import config, cursors  # type: ignore
+
+
+def test_headers_prefetched_on_extra_connections(monkeypatch, tmp_path) -> None:
+    groups = ["alt.one", "alt.two", "alt.three", "alt.four"]
+    monkeypatch.setattr(config, "get_nntp_groups", lambda: list(groups))
+    monkeypatch.setattr(config, "NNTP_MAX_CONN", 3)
+    monkeypatch.setattr(cursors, "get_cursor", lambda _g: 0)
+    monkeypatch.setattr(cursors, "set_cursor", lambda _g, _c: None)
+    monkeypatch.setattr(cursors, "set_cursors", lambda _u: None)
+    monkeypatch.setattr(cursors, "mark_irrelevant", lambda _g: None)
+    monkeypatch.setattr(cursors, "get_irrelevant_groups", lambda: set())
+    monkeypatch.setattr(loop, "get_group_mode", lambda: "curated")
+    monkeypatch.setattr(cursors, "reset_for_curated", lambda: False)
+
+    fetched: dict[str, str] = {}
+    created: list[object] = []
+    lock = threading.Lock()
+
+    class DummyClient:
+        def __init__(self, _settings: object = None) -> None:
+            self.closed = False
+            created.append(self)
+
+        def high_water_mark(self, group: str) -> int:
+            return 1
+
+        def xover(self, group: str, start: int, end: int):
+            with lock:
+                fetched.setdefault(group, threading.current_thread().name)
+            return [{"subject": f"{group} Example", ":bytes": "456"}]
+
+        def quit(self) -> None:
+            self.closed = True
+
+    monkeypatch.setattr(loop, "NNTPClient", DummyClient)
+
+    db_path = tmp_path / "db.sqlite"
+
+    def _connect() -> sqlite3.Connection:
+        conn = sqlite3.connect(db_path)
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS release (norm_title TEXT, category TEXT, category_id INT, language TEXT, tags TEXT, source_group TEXT, size_bytes BIGINT, posted_at TIMESTAMPTZ, has_parts INT NOT NULL DEFAULT 0, part_count INT NOT NULL DEFAULT 0, UNIQUE (norm_title, category_id, posted_at))"
+        )
+        return conn
+
+    monkeypatch.setattr(loop, "connect_db", _connect)
+
+    main_client = DummyClient()
+    loop.run_once(main_client)
+
+    assert set(fetched) == set(groups)
+    assert fetched["alt.one"] == threading.current_thread().name
+    assert all(fetched[g].startswith("nntp-prefetch") for g in ("alt.two", "alt.three"))
+    # Two prefetch connections at most, both closed once the cycle ends.
+    workers = [c for c in created if c is not main_client]
+    assert 1 <= len(workers) <= 2
+    assert all(c.closed for c in workers)
+    with sqlite3.connect(db_path) as check:
+        count = check.execute("SELECT COUNT(*) FROM release").fetchone()[0]
+    assert count == len(groups)
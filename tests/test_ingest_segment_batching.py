@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+import sqlite3
+
+import orjson
+
+import nzbidx_ingest.ingest_loop as loop  # type: ignore
+from nzbidx_ingest import config, cursors  # type: ignore
+
+
+def test_segments_merged_with_one_lookup(monkeypatch, tmp_path) -> None:
+    monkeypatch.setattr(config, "get_nntp_groups", lambda: ["alt.test"])
+    monkeypatch.setattr(loop, "get_group_mode", lambda: "curated")
+    monkeypatch.setattr(cursors, "reset_for_curated", lambda: False)
+    monkeypatch.setattr(loop, "prune_non_curated_groups", lambda _db, _g: None)
+    monkeypatch.setattr(cursors, "get_cursor", lambda _g: 0)
+    monkeypatch.setattr(cursors, "set_cursor", lambda _g, _c: None)
+    monkeypatch.setattr(cursors, "set_cursors", lambda _u: None)
+    monkeypatch.setattr(cursors, "mark_irrelevant", lambda _g: None)
+    monkeypatch.setattr(cursors, "get_irrelevant_groups", lambda: set())
+
+    class DummyClient:
+        def high_water_mark(self, group: str) -> int:
+            return 3
+
+        def xover(self, group: str, start: int, end: int):
+            return [
+                {"subject": "Alpha (1/1)", ":bytes": "100", "message-id": "<a>"},
+                {"subject": "Beta (1/1)", ":bytes": "200", "message-id": "<b>"},
+                {"subject": "Gamma (1/1)", ":bytes": "300", "message-id": "<c>"},
+            ]
+
+    db_path = tmp_path / "db.sqlite"
+    statements: list[str] = []
+
+    def _connect() -> sqlite3.Connection:
+        conn = sqlite3.connect(db_path)
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS release (norm_title TEXT, category TEXT, category_id INT, language TEXT, tags TEXT, source_group TEXT, size_bytes BIGINT, posted_at TIMESTAMPTZ, segments TEXT, has_parts INT NOT NULL DEFAULT 0, part_count INT NOT NULL DEFAULT 0, UNIQUE (norm_title, category_id, posted_at))"
+        )
+        conn.set_trace_callback(statements.append)
+        return conn
+
+    monkeypatch.setattr(loop, "connect_db", _connect)
+
+    loop.run_once(DummyClient())
+
+    lookups = [s for s in statements if s.startswith("SELECT norm_title, segments")]
+    assert len(lookups) == 1
+    assert "'alpha'" in lookups[0] and "'gamma'" in lookups[0]
+    with sqlite3.connect(db_path) as check:
+        rows = check.execute(
+            "SELECT norm_title, size_bytes, part_count FROM release ORDER BY norm_title"
+        ).fetchall()
+    assert rows == [("alpha", 100, 1), ("beta", 200, 1), ("gamma", 300, 1)]
+
+    # Re-scanning the same headers finds nothing new to write.
+    statements.clear()
+    loop.run_once(DummyClient())
+    assert not any(s.startswith("UPDATE release SET segments") for s in statements)
+
+
+def test_segments_merged_on_server_for_postgres(monkeypatch) -> None:
+    monkeypatch.setattr(config, "get_nntp_groups", lambda: ["alt.test"])
+    monkeypatch.setattr(loop, "get_group_mode", lambda: "curated")
+    monkeypatch.setattr(cursors, "reset_for_curated", lambda: False)
+    monkeypatch.setattr(loop, "prune_non_curated_groups", lambda _db, _g: None)
+    monkeypatch.setattr(cursors, "get_cursor", lambda _g: 0)
+    monkeypatch.setattr(cursors, "set_cursor", lambda _g, _c: None)
+    monkeypatch.setattr(cursors, "set_cursors", lambda _u: None)
+    monkeypatch.setattr(cursors, "mark_irrelevant", lambda _g: None)
+    monkeypatch.setattr(cursors, "get_irrelevant_groups", lambda: set())
+
+    class DummyClient:
+        def high_water_mark(self, group: str) -> int:
+            return 2
+
+        def xover(self, group: str, start: int, end: int):
+            return [
+                {"subject": "Alpha (1/2)", ":bytes": "100", "message-id": "<a1>"},
+                {"subject": "Alpha (2/2)", ":bytes": "100", "message-id": "<a2>"},
+            ]
+
+    executed: list[tuple[str, tuple]] = []
+
+    class FakeCursor:
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc) -> None:
+            return None
+
+        def execute(self, sql: str, params: tuple = ()) -> None:
+            executed.append((sql, params))
+
+        def executemany(self, sql: str, rows) -> None:
+            executed.append((sql, tuple(rows)))
+
+        def fetchall(self):
+            return [("alpha", 7000, 10**10, 2)]
+
+    class FakeConn:
+        def cursor(self) -> FakeCursor:
+            return FakeCursor()
+
+        def commit(self) -> None:
+            pass
+
+        def rollback(self) -> None:
+            pass
+
+    monkeypatch.setattr(loop, "connect_db", FakeConn)
+    monkeypatch.setattr(loop, "insert_release", lambda _db, releases: {"alpha"})
+
+    loop.run_once(DummyClient())
+
+    merges = [params for sql, params in executed if sql == loop._MERGE_SEGMENTS_SQL]
+    assert merges
+    batch = orjson.loads(merges[0][0])
+    assert batch == [
+        {
+            "norm_title": "alpha",
+            "segments": [
+                {"number": 1, "message_id": "a1", "group": "alt.test", "size": 100},
+                {"number": 2, "message_id": "a2", "group": "alt.test", "size": 100},
+            ],
+        }
+    ]
+    assert not any("SELECT norm_title, segments" in sql for sql, _ in executed)
+    assert not any(sql.startswith("DELETE") for sql, _ in executed)
+
+
+def test_duplicate_headers_merge_tags_once(monkeypatch) -> None:
+    monkeypatch.setattr(config, "get_nntp_groups", lambda: ["alt.test"])
+    monkeypatch.setattr(loop, "get_group_mode", lambda: "curated")
+    monkeypatch.setattr(cursors, "reset_for_curated", lambda: False)
+    monkeypatch.setattr(loop, "prune_non_curated_groups", lambda _db, _g: None)
+    monkeypatch.setattr(cursors, "get_cursor", lambda _g: 0)
+    monkeypatch.setattr(cursors, "set_cursor", lambda _g, _c: None)
+    monkeypatch.setattr(cursors, "set_cursors", lambda _u: None)
+    monkeypatch.setattr(cursors, "mark_irrelevant", lambda _g: None)
+    monkeypatch.setattr(cursors, "get_irrelevant_groups", lambda: set())
+
+    class DummyClient:
+        def high_water_mark(self, group: str) -> int:
+            return 3
+
+        def xover(self, group: str, start: int, end: int):
+            return [
+                {"subject": "[zeta] Alpha (1/3)", ":bytes": "100"},
+                {"subject": "[beta] Alpha (2/3)", ":bytes": "100"},
+                {"subject": "[zeta] Alpha (3/3)", ":bytes": "100"},
+                {"subject": "[omega][gamma] Beta (1/1)", ":bytes": "100"},
+            ]
+
+    captured: list[tuple] = []
+
+    def _insert(_db, releases):
+        captured.extend(releases)
+        return set()
+
+    monkeypatch.setattr(loop, "connect_db", lambda: None)
+    monkeypatch.setattr(loop, "insert_release", _insert)
+
+    loop.run_once(DummyClient())
+
+    tags = {row[0]: row[3] for row in captured}
+    assert tags == {"alpha": ["beta", "zeta"], "beta": ["omega", "gamma"]}
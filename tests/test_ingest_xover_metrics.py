@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+import nzbidx_ingest.ingest_loop as loop  # type: ignore
+from nzbidx_api import metrics_log  # type: ignore
+from nzbidx_ingest import config, cursors  # type: ignore
+
+
+def test_xover_failure_counted_per_group(monkeypatch) -> None:
+    monkeypatch.setattr(config, "get_nntp_groups", lambda: ["alt.fail"])
+    monkeypatch.setattr(loop, "get_group_mode", lambda: "curated")
+    monkeypatch.setattr(cursors, "reset_for_curated", lambda: False)
+    monkeypatch.setattr(loop, "prune_non_curated_groups", lambda _db, _g: None)
+    monkeypatch.setattr(cursors, "get_cursor", lambda _g: 0)
+    monkeypatch.setattr(cursors, "set_cursors", lambda _u: None)
+    monkeypatch.setattr(loop, "connect_db", lambda: None)
+    monkeypatch.setattr(loop, "_group_failures", {})
+
+    class DummyClient:
+        def high_water_mark(self, group: str) -> int:
+            return 5
+
+        def xover(self, group: str, start: int, end: int):
+            raise OSError("connection reset")
+
+    key = "ingest_xover_failures_total{group=alt.fail}"
+    before = metrics_log.get_counters().get(key, 0)
+
+    loop.run_once(DummyClient())
+
+    assert metrics_log.get_counters().get(key, 0) == before + 1
+    assert loop._group_failures["alt.fail"] == 1
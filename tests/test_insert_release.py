@@ -139,7 +139,10 @@ def test_insert_release_skips_data_error(monkeypatch, caplog) -> None:
             self._results = []
 
         def execute(self, sql, params=None):
-            if sql.startswith("SELECT"):
+            if sql.lstrip().startswith("WITH"):
+                if "bad" in params[0]:
+                    raise FakeDataError("bad")
+            elif sql.startswith("SELECT"):
                 self._results = []
             else:
                 title = params[0]
@@ -192,3 +195,106 @@ def test_insert_release_skips_data_error(monkeypatch, caplog) -> None:
         record.message == "insert_release_data_error" and record.norm_title == "bad"
         for record in caplog.records
     )
+
+
+def test_insert_release_postgres_single_statement() -> None:
+    from nzbidx_ingest import main
+
+    executed: list[tuple[str, list]] = []
+
+    class DummyCursor:
+        def execute(self, sql, params=None):
+            executed.append((sql, params))
+            return self
+
+        def fetchall(self):
+            # "bar" already existed, so only "foo" was written.
+            return [("foo",)]
+
+    class DummyConn:
+        def cursor(self):
+            return DummyCursor()
+
+        def commit(self) -> None:
+            return None
+
+    DummyConn.__module__ = "psycopg"
+
+    releases = [
+        ("foo", CATEGORY_MAP["movies"], "en", ["x"], "g", 100, None),
+        (
+            "bar",
+            CATEGORY_MAP["movies"],
+            "en",
+            [],
+            "g",
+            200,
+            "2024-01-01T00:00:00+00:00",
+        ),
+    ]
+    inserted = main.insert_release(DummyConn(), releases=releases)
+
+    assert inserted == {"foo"}
+    assert len(executed) == 1
+    sql, params = executed[0]
+    assert sql is main._INSERT_RELEASES_SQL
+    assert params[0] == ["foo", "bar"]
+    assert params[2] == [int(CATEGORY_MAP["movies"])] * 2
+    assert params[4] == ["x", ""]
+
+
+def test_insert_release_postgres_large_batch_uses_copy(monkeypatch) -> None:
+    from nzbidx_ingest import main
+
+    monkeypatch.setattr(main, "RELEASE_COPY_MIN_ROWS", 2)
+    executed: list[str] = []
+    copied: list[tuple] = []
+
+    class DummyCopy:
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc) -> None:
+            return None
+
+        def set_types(self, types) -> None:
+            assert len(types) == 9
+
+        def write_row(self, row) -> None:
+            copied.append(row)
+
+    class DummyCursor:
+        def execute(self, sql, params=None):
+            executed.append(sql)
+            return self
+
+        def copy(self, sql):
+            executed.append(sql)
+            return DummyCopy()
+
+        def fetchall(self):
+            return [("foo",), ("bar",)]
+
+    class DummyConn:
+        def cursor(self):
+            return DummyCursor()
+
+        def commit(self) -> None:
+            return None
+
+    DummyConn.__module__ = "psycopg"
+
+    releases = [
+        ("foo", CATEGORY_MAP["movies"], "en", [], "g", 100, None),
+        ("bar", CATEGORY_MAP["movies"], "en", [], "g", 200, None),
+    ]
+    inserted = main.insert_release(DummyConn(), releases=releases)
+
+    assert inserted == {"foo", "bar"}
+    assert executed == [
+        main._RELEASE_STAGE_SQL,
+        main._RELEASE_STAGE_COPY_SQL,
+        main._INSERT_STAGED_RELEASES_SQL,
+    ]
+    assert [row[0] for row in copied] == ["foo", "bar"]
+    assert [row[-1] for row in copied] == [1, 2]
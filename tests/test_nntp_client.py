@@ -241,3 +241,24 @@ def test_body_size_from_stat(monkeypatch) -> None:
     monkeypatch.setattr(client, "_ensure_connection", lambda: DummyServer())
 
     assert client.body_size("m1") == 456
+
+
+def test_body_sizes_uses_one_xhdr_per_header(monkeypatch) -> None:
+    monkeypatch.setenv("NNTP_HOST", "example.com")
+    calls: list[tuple[str, str]] = []
+
+    class DummyServer:
+        def group(self, name):
+            return ("211", 0, "1", "3", name)
+
+        def xhdr(self, header, span):
+            calls.append((header, span))
+            if header == "Bytes":
+                return "", [("1", "100"), ("2", "bogus"), ("3", "300")]
+            return "", [("1", "<a>"), ("2", "<b>"), ("3", "<c>")]
+
+    client = nntp_client.NNTPClient(ingest_config.nntp_settings())
+    monkeypatch.setattr(client, "_ensure_connection", lambda: DummyServer())
+
+    assert client.body_sizes("alt.test", 1, 3) == {"a": 100, "c": 300}
+    assert calls == [("Bytes", "1-3"), ("Message-ID", "1-3")]
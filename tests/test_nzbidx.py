@@ -690,6 +690,19 @@ def test_infer_category_from_group() -> None:
     assert _infer_category("Test", group="alt.binaries.porn") == CATEGORY_MAP["xxx"]
 
 
+def test_group_hint_cached_per_group() -> None:
+    """The group hint is looked up once per group name."""
+    main._group_hint.cache_clear()
+    assert main._group_hint("alt.binaries.psp") == "console_psp"
+    assert main._group_hint("alt.binaries.PSP") == "console_psp"
+    assert main._group_hint("alt.test") is None
+    main._group_hint.cache_clear()
+    _infer_category.cache_clear()
+    _infer_category("Test 1", group="alt.binaries.psp")
+    _infer_category("Test 2", group="alt.binaries.psp")
+    assert main._group_hint.cache_info().hits == 1
+
+
 def test_group_category_hints_file(tmp_path, monkeypatch) -> None:
     """Hints should be extendable via an external config file."""
     cfg = tmp_path / "hints.json"
@@ -1237,6 +1250,7 @@ def test_batch_throttle_on_latency(monkeypatch) -> None:
     monkeypatch.setattr(config, "NNTP_GROUPS", ["alt.test"], raising=False)
     monkeypatch.setattr(cursors, "get_cursor", lambda _g: 0)
     monkeypatch.setattr(cursors, "set_cursor", lambda _g, _c: None)
+    monkeypatch.setattr(cursors, "set_cursors", lambda _u: None)
     monkeypatch.setattr(cursors, "mark_irrelevant", lambda _g: None)
     monkeypatch.setattr(cursors, "get_irrelevant_groups", lambda: set())
     monkeypatch.setattr(loop, "INGEST_DB_LATENCY_MS", 0, raising=False)
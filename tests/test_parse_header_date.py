@@ -0,0 +1,53 @@
+from datetime import timezone
+from email.utils import parsedate_to_datetime
+
+import pytest
+
+from nzbidx_ingest import parsers
+from nzbidx_ingest.parsers import parse_header_date
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        "Mon, 01 Jan 2024 12:34:56 +0000",
+        "Tue, 2 Jan 2024 01:02:03 -0500",
+        "2 Jan 2024 23:59:59 +0530",
+        "Wed, 31 Dec 2025 23:00 GMT",
+        "Thu, 15 Feb 2024 08:00:00 +0100 (CET)",
+    ],
+)
+def test_parse_header_date_matches_stdlib(value: str) -> None:
+    expected = parsedate_to_datetime(value).astimezone(timezone.utc)
+    assert parse_header_date(value) == expected
+
+
+def test_parse_header_date_falls_back(monkeypatch) -> None:
+    calls: list[str] = []
+    original = parsers.parsedate_to_datetime
+
+    def _fallback(value: str):
+        calls.append(value)
+        return original(value)
+
+    monkeypatch.setattr(parsers, "parsedate_to_datetime", _fallback)
+    parse_header_date("Mon, 01 Jan 2024 12:34:56 +0000")
+    assert calls == []
+    parse_header_date("Mon, 01 Jan 24 12:34:56 +0000")
+    assert calls == ["Mon, 01 Jan 24 12:34:56 +0000"]
+
+
+def test_parse_header_date_rejects_garbage() -> None:
+    with pytest.raises((TypeError, ValueError)):
+        parse_header_date("not a date")
+
+
+def test_posted_fields_formats_and_caches() -> None:
+    from nzbidx_ingest.ingest_loop import _posted_fields
+
+    _posted_fields.cache_clear()
+    raw = "Tue, 2 Jan 2024 01:02:03 -0500"
+    assert _posted_fields(raw) == ("2024-01-02T06:02:03+00:00", "2024-01-02")
+    _posted_fields(raw)
+    assert _posted_fields.cache_info().hits == 1
+    assert _posted_fields("not a date") == (None, "")
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import asyncio
+
+
+def test_db_maintenance_schedules_partition_creation(monkeypatch):
+    import nzbidx_api.main as main
+
+    monkeypatch.setenv("ENABLE_DB_MAINTENANCE", "1")
+
+    async def runner():
+        await main.start_db_maintenance()
+        try:
+            jobs = main._db_maintenance_scheduler.get_jobs()
+            assert main.create_future_partitions in [job.func for job in jobs]
+        finally:
+            await main.stop_db_maintenance()
+
+    asyncio.run(runner())
+
+
+def test_create_future_partitions_runs_on_prepared_driver(monkeypatch, prepared_cursor):
+    from types import SimpleNamespace
+    from unittest import mock
+
+    from nzbidx_api import db
+    from nzbidx_ingest import db_migrations
+
+    db_migrations._forget_partitions()
+    raw = mock.Mock()
+    raw.cursor.return_value = prepared_cursor
+    prepared_cursor.fetchall.return_value = [
+        (f"release_{c}", "RANGE (posted_at)") for c in db_migrations.DATED_CATEGORIES
+    ]
+
+    class DummyConn:
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *exc):
+            return None
+
+        async def run_sync(self, fn):
+            return fn(SimpleNamespace(connection=SimpleNamespace(dbapi_connection=raw)))
+
+    class DummyEngine:
+        def connect(self):
+            return DummyConn()
+
+    monkeypatch.setattr(db, "get_engine", lambda: DummyEngine())
+
+    asyncio.run(db.create_future_partitions())
+
+    year = db_migrations.datetime.now().year
+    stmts = [c[0][0] for c in prepared_cursor.execute.call_args_list]
+    for category in db_migrations.DATED_CATEGORIES:
+        for y in (year, year + 1):
+            assert any(
+                s.startswith(f"CREATE TABLE IF NOT EXISTS release_{category}_{y} ")
+                for s in stmts
+            )
+    raw.commit.assert_called_once()
+    db_migrations._forget_partitions()